@@ -0,0 +1,56 @@
+"""Memory used by collections of length 1 geometry objects.
+
+Compares the slotted classes with the old layout, emulated by a subclass with a
+__dict__ that builds the derived attributes (Coord axes, GPS longitude factor)
+up front as the old __init__ methods did.
+
+    python benchmarks/bench_memory.py
+"""
+
+import tracemalloc
+import numpy as np
+from geometry import Point, Quaternion, Coord, GPS
+
+
+EAGER = {
+    Coord: ["origin", "x_axis", "y_axis", "z_axis"],
+    GPS: ["_longfac"],
+}
+
+
+def measure(factory, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    items = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    del items
+    return size / count
+
+
+def old_layout(cls):
+    """a subclass with a __dict__ that computes the derived attributes on construction"""
+    names = EAGER.get(cls, [])
+
+    def _wrap(Cls, data):
+        obj = super(Old, Cls)._wrap(data)
+        for name in names:
+            obj.__dict__[f"eager_{name}"] = getattr(cls, name).fget(obj)
+        return obj
+
+    Old = type(f"Old{cls.__name__}", (cls,), dict(_wrap=classmethod(_wrap)))
+    return Old
+
+
+if __name__ == "__main__":
+    count = 100_000
+    for cls in [Point, Quaternion, Coord, GPS]:
+        data = np.ones((count, len(cls.cols)))
+        slotted = measure(lambda i: cls._wrap(data[i : i + 1]), count)
+        Old = old_layout(cls)
+        old = measure(lambda i: Old._wrap(data[i : i + 1]), count)
+        print(
+            f"{cls.__name__:>10}: {slotted:7.1f} bytes/object with __slots__, "
+            f"{old:7.1f} with the old layout ({1 - slotted / old:.0%} less)"
+        )
@@ -10,13 +10,15 @@ You should have received a copy of the GNU General Public License along with
 this program. If not, see <http://www.gnu.org/licenses/>.
 """
 from .base import Base
+from .interpolation import TimeIndex, InterpolationPlan, resample
 from .time import Time
 from . import angles as angles
 from .point import *
 from .quaternion import *
+from .attitude import AttitudeIntegrator
 from .gps import GPS
 from .coordinate_frame import Coord
-from .transformation import Transformation
+from .transformation import Transformation, TransformChain
 from .mass import Mass
 from .air import Air
 from .angles import wrap_to_pi
@@ -9,6 +9,7 @@ def get_rho(pressure, temperature):
 
 
 class Air(Base):
+    __slots__ = ()
     cols = ["P", "T", "rho"]
 
     @staticmethod
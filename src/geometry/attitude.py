@@ -0,0 +1,163 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+from __future__ import annotations
+from numbers import Number
+from typing import Literal
+import numpy as np
+import numpy.typing as npt
+from .point import Point
+from .quaternion import Quaternion, quaternion_product
+from .time import Time
+
+
+class AttitudeIntegrator:
+    """Integrates body axis rates into an attitude, one batch of samples at a time.
+
+    The attitude at each sample is q[k+1] = q[k] * dq[k], where dq[k] is the rotation over
+    dt[k] from the rates at sample k (and k+1 for the higher order schemes):
+        exp: first order exponential map of rate[k] * dt[k], as Quaternion.body_rotate.
+        rk4: fourth order Runge Kutta on qdot = q * (0, rate / 2), rates linear over the step.
+        magnus: second order Magnus expansion (includes the coning correction).
+    The increments are calculated vectorised, only the quaternion chain is sequential.
+    The chain is renormalised every renormalise steps. Results are written block by block
+    into a preallocated float64 buffer that grows as required, if history is False the buffer
+    is reused for each batch and only the current attitude is kept.
+    """
+
+    block_size = 4096
+
+    def __init__(
+        self,
+        q0: Quaternion = None,
+        scheme: Literal["exp", "rk4", "magnus"] = "exp",
+        renormalise: int = 100,
+        capacity: int = 1024,
+        history: bool = True,
+    ):
+        if scheme not in ["exp", "rk4", "magnus"]:
+            raise ValueError(f"unknown integration scheme {scheme}")
+        self.scheme = scheme
+        self.renormalise = renormalise
+        self.history = history
+        self._q = tuple(float(v) for v in (Quaternion.zero() if q0 is None else q0).norm().data[0])
+        self._buffer = np.empty((capacity, 4))
+        self._count = 0
+        self._steps = 0
+        self._last_rate = None
+        self._last_dt = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def attitude(self) -> Quaternion:
+        """the attitude at the most recent sample"""
+        return Quaternion._wrap(np.array([self._q]))
+
+    @property
+    def attitudes(self) -> Quaternion:
+        """all the attitudes calculated so far (or in the last batch if history is False)"""
+        return Quaternion._wrap(self._buffer[: self._count])
+
+    def _reserve(self, count: int) -> npt.NDArray:
+        """rows of the buffer to write the next count attitudes into"""
+        start = self._count if self.history else 0
+        if start + count > len(self._buffer):
+            buffer = np.empty((max(2 * len(self._buffer), start + count), 4))
+            buffer[:start] = self._buffer[:start]
+            self._buffer = buffer
+        self._count = start + count
+        return self._buffer[start : start + count]
+
+    def increments(self, rates: npt.NDArray, dt: npt.NDArray) -> npt.NDArray:
+        """the (N-1,4) rotations between consecutive samples of (N,3) rates and (N,) dt"""
+        w0, w1, h = rates[:-1], rates[1:], dt[:-1, None]
+        if self.scheme == "exp":
+            return Quaternion.from_axis_angle(Point._wrap(w0 * h)).data
+        elif self.scheme == "magnus":
+            return Quaternion.from_axis_angle(
+                Point._wrap(h * (w0 + w1) / 2 + h**2 * np.cross(w0, w1) / 12)
+            ).data
+
+        def pure(w):  # the quaternion (0, w / 2), multiplied by h
+            return np.column_stack([np.zeros(len(w)), w / 2]) * h
+
+        one = np.array([[1.0, 0, 0, 0]])
+        a1, a2, a4 = pure(w0), pure((w0 + w1) / 2), pure(w1)
+        d1 = a1
+        d2 = quaternion_product(one + d1 / 2, a2)
+        d3 = quaternion_product(one + d2 / 2, a2)
+        d4 = quaternion_product(one + d3, a4)
+        return one + (d1 + 2 * d2 + 2 * d3 + d4) / 6
+
+    def _chain(self, increments: npt.NDArray, out: npt.NDArray):
+        """multiply the current attitude by each increment in turn, writing each attitude to out"""
+        res = []
+        w, x, y, z = self._q
+        steps, renormalise = self._steps, self.renormalise
+        for dw, dx, dy, dz in increments.tolist():
+            w, x, y, z = (
+                w * dw - x * dx - y * dy - z * dz,
+                w * dx + x * dw + y * dz - z * dy,
+                w * dy - x * dz + y * dw + z * dx,
+                w * dz + x * dy - y * dx + z * dw,
+            )
+            steps += 1
+            if steps >= renormalise:
+                n = (w * w + x * x + y * y + z * z) ** 0.5
+                w, x, y, z = w / n, x / n, y / n, z / n
+                steps = 0
+            res.append((w, x, y, z))
+        out[:] = res
+        self._q, self._steps = (w, x, y, z), steps
+
+    def update(self, rates: Point, dt: Number | npt.NDArray | Time) -> Quaternion:
+        """integrate a batch of body rates (rad/s) with the time step to the next sample.
+        returns the attitude at each sample in the batch.
+        The batch is processed in blocks of block_size samples, so the only full length
+        array that is created is the output."""
+        if isinstance(dt, Time):
+            dt = dt.dt
+        n = len(rates)
+        dt = np.broadcast_to(np.asarray(dt, dtype=float), (n,))
+        rdata = rates.data
+        out = self._reserve(n)
+        if n == 0:
+            return Quaternion._wrap(out.copy())
+
+        start = 0
+        if self._last_rate is None:
+            out[0] = self._q
+            start = 1
+        for b in range(start, n, self.block_size):
+            e = min(b + self.block_size, n)
+            if b == 0:
+                wdata = np.concatenate([self._last_rate, rdata[:e]])
+                hdata = np.concatenate([self._last_dt, dt[:e]])
+            else:
+                wdata, hdata = rdata[b - 1 : e], dt[b - 1 : e]
+            self._chain(self.increments(wdata, hdata), out[b:e])
+
+        self._last_rate, self._last_dt = rdata[-1:].copy(), dt[-1:].copy()
+        return Quaternion._wrap(out if self.history else out.copy())
+
+    @staticmethod
+    def integrate(
+        rates: Point,
+        dt: Number | npt.NDArray | Time,
+        q0: Quaternion = None,
+        scheme: Literal["exp", "rk4", "magnus"] = "exp",
+        renormalise: int = 100,
+    ) -> Quaternion:
+        """integrate a full series of body rates in one go"""
+        integrator = AttitudeIntegrator(q0, scheme, renormalise, capacity=len(rates))
+        return integrator.update(rates, dt)
@@ -16,6 +16,8 @@ import numpy as np
 import numpy.typing as npt
 import pandas as pd
 from numbers import Number
+from geometry.interpolation import TimeIndex, InterpolationPlan
+from geometry.utils import get_index, apply_index_slices
 
 
 def dprep(func):
@@ -28,7 +30,7 @@ def dprep(func):
         bdat = self._dprep(b)
 
         if len(bdat) > 1 and len(self) == 1:
-            a = self.tile(len(bdat))
+            a = self._broadcast(len(bdat))
         else:
             a = self
         return func(a, bdat)
@@ -36,13 +38,89 @@ def dprep(func):
     return wrapper
 
 
+class Column:
+    """descriptor giving access to a column of Base.data as a strided view"""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+    def __get__(self, obj, objtype=None) -> npt.NDArray[np.float64]:
+        if obj is None:
+            return self
+        return obj.data[:, self.index]
+
+
+class NumpyMethod:
+    """descriptor applying a numpy function to Base.data and wrapping the result"""
+
+    __slots__ = ("fun",)
+
+    def __init__(self, fun):
+        self.fun = fun
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj.__class__._wrap(self.fun(obj.data))
+
+
+ARRAY_FUNCTIONS = {}
+
+
+def array_function(np_function):
+    """register an implementation of a numpy function for Base.__array_function__"""
+
+    def decorator(func):
+        ARRAY_FUNCTIONS[np_function] = func
+        return func
+
+    return decorator
+
+
+def _unwrap(arg):
+    """replace Base instances with their data, looking inside lists, tuples and dicts"""
+    if isinstance(arg, Base):
+        return arg.data
+    elif isinstance(arg, (list, tuple)):
+        return type(arg)(_unwrap(a) for a in arg)
+    elif isinstance(arg, dict):
+        return {k: _unwrap(v) for k, v in arg.items()}
+    return arg
+
+
 class Base:
-    __array_priority__ = (
-        15.0  # this is a quirk of numpy so the __r*__ methods here take priority
-    )
+    __slots__ = ("data",)
     cols = []
     from_np_base = []
     from_np = []
+    _dtype = np.float64  # see set_dtype
+    interpolation_method = "linterp"  # used by interpolate and resample
+
+    @classmethod
+    def set_dtype(cls, dtype: npt.DTypeLike):
+        """set the dtype that the constructors and factory methods of cls produce.
+        Base.set_dtype sets the default for all classes that do not set their own."""
+        cls._dtype = np.dtype(dtype).type
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.data.dtype
+
+    def astype(self, dtype: npt.DTypeLike) -> Self:
+        return self.__class__._wrap(self.data.astype(dtype))
+
+    def __init_subclass__(cls, **kwargs):
+        """add a Column descriptor for each col and a NumpyMethod for each name in
+        from_np and from_np_base, unless the name is already used by the class."""
+        super().__init_subclass__(**kwargs)
+        for i, col in enumerate(cls.cols):
+            if not hasattr(cls, col) or isinstance(getattr(cls, col), Column):
+                setattr(cls, col, Column(i))
+        for name in cls.from_np + cls.from_np_base:
+            if not hasattr(cls, name) or isinstance(getattr(cls, name), NumpyMethod):
+                setattr(cls, name, NumpyMethod(getattr(np, name)))
 
     def __init__(self, *args, **kwargs):
         if len(kwargs) > 0:
@@ -99,7 +177,15 @@ class Base:
 
     @classmethod
     def from_numpy(Cls, data: npt.NDArray, cols: str | list):
-        return Cls(np.column_stack([data[:, cols.index(col)] for col in Cls.cols]))
+        return Cls._wrap(np.column_stack([data[:, cols.index(col)] for col in Cls.cols]))
+
+    @classmethod
+    def _wrap(cls, data: npt.NDArray) -> Self:
+        """construct an instance around data without validating or copying it.
+        data must already be an array of shape (N, len(cls.cols))."""
+        obj = cls.__new__(cls)
+        obj.data = data
+        return obj
 
     @classmethod
     def _clean_data(cls, data) -> npt.NDArray[np.float64]:
@@ -112,18 +198,23 @@ class Base:
             data = data.reshape(1, len(data))
 
         assert data.shape[1] == len(cls.cols)
-        return data
+        return data.astype(cls._dtype, copy=False)
 
     @classmethod
     def type_check(cls, a):
         return a if isinstance(a, cls) else cls(a)
 
+    def _broadcast(self, count: int) -> Self:
+        """a read only view of self repeated count times, self must have length 1 or count"""
+        return self.__class__._wrap(np.broadcast_to(self.data, (count, self.data.shape[1])))
+
     @classmethod
     def length_check(cls, a, b):
+        """broadcast a and b to the same length, length 1 inputs become read only views"""
         if len(a) == 1 and len(b) > 1:
-            a = a.tile(len(b))
+            a = a._broadcast(len(b)) if isinstance(a, Base) else np.broadcast_to(a, (len(b),) + a.shape[1:])
         elif len(b) == 1 and len(a) > 1:
-            b = b.tile(len(a))
+            b = b._broadcast(len(a)) if isinstance(b, Base) else np.broadcast_to(b, (len(a),) + b.shape[1:])
         elif len(a) > 1 and len(b) > 1 and not len(a) == len(b):
             raise TypeError(
                 f"lengths of passed arguments must be equal or 1, got {len(a)}, {len(b)}"
@@ -132,23 +223,18 @@ class Base:
 
     @classmethod
     def concatenate(cls, items) -> Self:
-        return cls(np.concatenate([i.data for i in items], axis=0))
+        return cls._wrap(np.concatenate([i.data for i in items], axis=0))
 
     def __getattr__(self, name) -> npt.NDArray[np.float64]:
-        if name in self.__class__.cols:
-            return self.data[:, self.__class__.cols.index(name)]
-            # return res[0] if len(res) == 1 else res
-        elif name in self.__class__.from_np + self.__class__.from_np_base:
-            return self.__class__(getattr(np, name)(self.data))
-        else:
-            for col in self.__class__.cols:
-                if len(name) > len(col):
-                    if name[: len(col)] == col:
-                        try:
-                            id = int(name[len(col) :])
-                        except ValueError:
-                            break
-                        return getattr(self, col)[id]
+        # only called when normal lookup fails, columns are handled by the Column descriptors
+        # so this just deals with indexed column access, eg x0 for the first value of x.
+        for i, col in enumerate(self.__class__.cols):
+            if len(name) > len(col) and name.startswith(col):
+                try:
+                    id = int(name[len(col) :])
+                except ValueError:
+                    break
+                return self.data[id, i]
 
         raise AttributeError(f"Cannot get attribute {name}")
 
@@ -156,7 +242,80 @@ class Base:
         return self.__class__.cols
 
     def __getitem__(self, sli) -> Self:
-        return self.__class__(self.data[sli, :])
+        data = self.data[sli, :]
+        return self.__class__._wrap(data.reshape(1, -1) if data.ndim == 1 else data)
+
+    def _operand(self, other):
+        """prepare other for a broadcast operation against self.data. Base instances must have
+        length 1 or len(self), 1d arrays are treated as one value per row.
+        Operands that would promote a floating point self.data to a wider dtype are cast to it."""
+        if isinstance(other, Base):
+            if len(other) != len(self) and len(other) > 1 and len(self) > 1:
+                raise TypeError(
+                    f"lengths of passed arguments must be equal or 1, got {len(self)}, {len(other)}"
+                )
+            other = other.data
+        elif isinstance(other, np.ndarray):
+            if other.ndim == 1:
+                other = other.reshape(-1, 1)
+            elif other.ndim > 2:
+                raise ValueError(f"array shape {other.shape} not handled")
+        elif not isinstance(other, Number):
+            return NotImplemented
+        dtype = self.data.dtype
+        if dtype.kind == "f" and np.result_type(other, dtype) != dtype:
+            return np.asarray(other, dtype=dtype)
+        return other
+
+    def _binary(self, ufunc: np.ufunc, other, reverse: bool = False) -> Self:
+        b = self._operand(other)
+        if b is NotImplemented:
+            return NotImplemented
+        return self.__class__._wrap(ufunc(b, self.data) if reverse else ufunc(self.data, b))
+
+    def _wrap_result(self, result):
+        if isinstance(result, tuple):
+            return tuple(self._wrap_result(r) for r in result)
+        if (
+            isinstance(result, np.ndarray)
+            and result.ndim == 2
+            and result.shape[1] == len(self.cols)
+            and result.dtype.kind != "b"
+        ):
+            return self.__class__._wrap(result)
+        return result
+
+    def __array__(self, dtype=None, copy=None) -> npt.NDArray:
+        return np.array(self.data, dtype=dtype, copy=copy)
+
+    def __array_ufunc__(self, ufunc: np.ufunc, method: str, *inputs, out=None, **kwargs):
+        """numpy ufuncs act on the data, broadcasting as the operators do.
+        Results with the same number of columns are returned as the class of the
+        first geometry input."""
+        if method != "__call__":
+            return NotImplemented
+        first = next((i for i in inputs + (out or ()) if isinstance(i, Base)), None)
+        if first is None:
+            return NotImplemented
+        args = [first._operand(i) for i in inputs]
+        if any(a is NotImplemented for a in args):
+            return NotImplemented
+        if ufunc is np.equal or ufunc is np.not_equal:
+            # array == geometry should behave like geometry == array, see Base.__eq__
+            res = np.all(np.equal(*args))
+            return res if ufunc is np.equal else ~res
+        if out is not None:
+            kwargs["out"] = tuple(o.data if isinstance(o, Base) else o for o in out)
+            ufunc(*args, **kwargs)
+            return out[0] if len(out) == 1 else out
+        return first._wrap_result(ufunc(*args, **kwargs))
+
+    def __array_function__(self, func, types, args, kwargs):
+        """numpy functions act on the data. Those in ARRAY_FUNCTIONS return geometry
+        objects, anything else returns whatever the numpy function returns."""
+        if func in ARRAY_FUNCTIONS:
+            return ARRAY_FUNCTIONS[func](*args, **kwargs)
+        return func(*_unwrap(args), **_unwrap(kwargs))
 
     def _dprep(self, other):
         l, w = len(self), len(self.cols)
@@ -165,12 +324,12 @@ class Base:
             if other.shape == (l, w):
                 return other
             elif other.shape == (l, 1) or other.shape == (l,):
-                return np.tile(other, (w, 1)).T
+                return np.broadcast_to(other.reshape(l, 1), (l, w))
             elif other.shape == (1,):
-                return np.full((l, w), other[0])
+                return np.broadcast_to(other.reshape(1, 1), (l, w))
             elif l == 1:
                 if len(other.shape) == 1:
-                    return np.tile(other, (w, 1)).T
+                    return np.broadcast_to(other.reshape(-1, 1), (len(other), w))
                 elif other.shape[1] == w:
                     return other
                 else:
@@ -178,7 +337,7 @@ class Base:
             else:
                 raise ValueError(f"array shape {other.shape} not handled")
         elif isinstance(other, float) or isinstance(other, int):
-            return np.full((l, w), other)
+            return np.broadcast_to(np.array(other), (l, w))
         elif isinstance(other, Base):
             a, b = self.__class__.length_check(self, other)
             return self._dprep(b.data)
@@ -186,10 +345,10 @@ class Base:
             raise ValueError(f"unhandled datatype ({other.__class__.name})")
 
     def radians(self) -> Self:
-        return self.__class__(np.radians(self.data))
+        return self.__class__._wrap(np.radians(self.data))
 
     def degrees(self) -> Self:
-        return self.__class__(np.degrees(self.data))
+        return self.__class__._wrap(np.degrees(self.data))
 
     def count(self) -> int:
         return len(self)
@@ -199,43 +358,35 @@ class Base:
 
     @property
     def ends(self) -> Self:
-        return self.__class__(self.data[[0, -1], :])
+        return self.__class__._wrap(self.data[[0, -1], :])
 
     @dprep
     def __eq__(self, other):
         return np.all(self.data == other)
 
-    @dprep
     def __add__(self, other) -> Self:
-        return self.__class__(self.data + other)
+        return self._binary(np.add, other)
 
-    @dprep
     def __radd__(self, other) -> Self:
-        return self.__class__(other + self.data)
+        return self._binary(np.add, other, reverse=True)
 
-    @dprep
     def __sub__(self, other) -> Self:
-        return self.__class__(self.data - other)
+        return self._binary(np.subtract, other)
 
-    @dprep
     def __rsub__(self, other) -> Self:
-        return self.__class__(other - self.data)
+        return self._binary(np.subtract, other, reverse=True)
 
-    @dprep
     def __mul__(self, other) -> Self:
-        return self.__class__(self.data * other)
+        return self._binary(np.multiply, other)
 
-    @dprep
     def __rmul__(self, other) -> Self:
-        return self.__class__(other * self.data)
+        return self._binary(np.multiply, other, reverse=True)
 
-    @dprep
     def __rtruediv__(self, other) -> Self:
-        return self.__class__(other / self.data)
+        return self._binary(np.true_divide, other, reverse=True)
 
-    @dprep
     def __truediv__(self, other) -> Self:
-        return self.__class__(self.data / other)
+        return self._binary(np.true_divide, other)
 
     def __str__(self):
         means = " ".join(
@@ -247,13 +398,13 @@ class Base:
         return np.linalg.norm(self.data, axis=1)
 
     def abs(self) -> Self:
-        return self.__class__(np.abs(self.data))
+        return self.__class__._wrap(np.abs(self.data))
 
     def __neg__(self) -> Self:
-        return self.__class__(-self.data)
+        return self.__class__._wrap(-self.data)
 
     def __pow__(self, power: Number) -> Self:
-        return self.__class__(self.data ** power)
+        return self.__class__._wrap(self.data ** power)
 
     @dprep
     def dot(self, other: Self) -> Self:
@@ -271,7 +422,7 @@ class Base:
             data = np.diff(self.data, axis=0)
 
         dt = dt if method == "gradient" else dt[:-1]
-        return self.__class__(data / np.tile(dt, (len(self.__class__.cols), 1)).T)
+        return self.__class__._wrap(data / np.asarray(dt, dtype=self.data.dtype).reshape(-1, 1))
 
     def to_pandas(self, prefix="", suffix="", columns=None, index=None):
         if columns is not None:
@@ -285,7 +436,7 @@ class Base:
         return self.to_pandas()
 
     def tile(self, count) -> Self:
-        return self.__class__(np.tile(self.data, (count, 1)))
+        return self.__class__._wrap(np.tile(self.data, (count, 1)))
 
     def to_dict(self):
         if len(self) == 1:
@@ -306,34 +457,34 @@ class Base:
 
     @classmethod
     def full(cls, val, count):
-        return cls(np.tile(val.data, (count, 1)))
+        return cls._wrap(np.tile(val.data, (count, 1)))
 
     def max(self):
-        return self.__class__(self.data.max(axis=0))
+        return self.__class__._wrap(self.data.max(axis=0).reshape(1, -1))
 
     def min(self):
-        return self.__class__(self.data.min(axis=0))
+        return self.__class__._wrap(self.data.min(axis=0).reshape(1, -1))
 
     def minloc(self):
-        return self.__class__(self.data.argmin(axis=0))
+        return self.__class__._wrap(self.data.argmin(axis=0).reshape(1, -1))
 
     def maxloc(self):
-        return self.__class__(self.data.argmax(axis=0))
+        return self.__class__._wrap(self.data.argmax(axis=0).reshape(1, -1))
 
     def cumsum(self):
-        return self.__class__(np.cumsum(self.data, axis=0))
+        return self.__class__._wrap(np.cumsum(self.data, axis=0))
 
     def round(self, decimals=0):
-        return self.__class__(self.data.round(decimals))
+        return self.__class__._wrap(self.data.round(decimals))
 
     def __repr__(self):
         return str(self)
 
     def copy(self):
-        return self.__class__(self.data.copy())
+        return self.__class__._wrap(self.data.copy())
 
     def unwrap(self, discont=np.pi):
-        return self.__class__(np.unwrap(self.data, discont=discont, axis=0))
+        return self.__class__._wrap(np.unwrap(self.data, discont=discont, axis=0))
 
     def filter(self, order, cutoff, ts: np.ndarray = None):
         from scipy.signal import butter, freqz, filtfilt
@@ -346,7 +497,7 @@ class Base:
         fs = 1 / T
         b, a = butter(order, cutoff, fs=fs, btype="low", analog=False)
 
-        return self.__class__(filtfilt(b, a, self.data, axis=0))
+        return self.__class__._wrap(filtfilt(b, a, self.data, axis=0))
 
     def fft(self, ts: np.ndarray = None):
         from scipy.fft import fft, fftfreq
@@ -367,13 +518,9 @@ class Base:
 
     def fill_zeros(self):
         """fills zero length rows with the previous or next non-zero value"""
-        return self.__class__(
+        return self.__class__._wrap(
             pd.DataFrame(
-                np.where(
-                    np.tile(abs(self) == 0, (3, 1)).T,
-                    np.full(self.data.shape, np.nan),
-                    self.data,
-                )
+                np.where((abs(self) == 0).reshape(-1, 1), np.nan, self.data)
             )
             .ffill()
             .bfill()
@@ -381,37 +528,53 @@ class Base:
         )
 
     def ffill(self):
-        return self.__class__(pd.DataFrame(self.data).ffill().to_numpy())
+        return self.__class__._wrap(pd.DataFrame(self.data).ffill().to_numpy())
 
     def bfill(self):
-        return self.__class__(pd.DataFrame(self.data).bfill().to_numpy())
+        return self.__class__._wrap(pd.DataFrame(self.data).bfill().to_numpy())
 
     def linterp(
         self,
-        index: npt.NDArray | pd.Index,
+        index: TimeIndex | npt.NDArray | pd.Index,
         extrapolate: Literal["throw", "nearest"] = "throw",
     ):
-        "linear interpolation"
-        index = pd.Index(np.arange(len(self)) if index is None else index)
-        assert len(index) == len(self)
-        assert pd.Index(index).is_monotonic_increasing
-
-        def dolinterp(ts: npt.NDArray | Number):
-            starts = index.get_indexer(ts, method="ffill")
-            stops = index.get_indexer(ts, method="bfill")
-            if np.any(starts * stops < 0) and extrapolate=="throw":
-                raise Exception("Cannot extrapolate beyond parent range")
-            return self.__class__(np.column_stack(
-                [
-                    np.interp(
-                        ts, index, self.data[:, i], self.data[0, i], self.data[-1, i]
-                    )
-                    for i, col in enumerate(self.cols)
-                ]
-            ))
-            # return lambda t: a + (b - a) * np.clip(t, 0, 1)
+        """linear interpolation, the returned function takes the times to interpolate at
+        or an InterpolationPlan made from the same index"""
+        index = TimeIndex.build(index, len(self))
+
+        def dolinterp(ts: npt.NDArray | Number | InterpolationPlan):
+            plan = ts if isinstance(ts, InterpolationPlan) else index.plan(ts)
+            # linterp has always held the first value below the range, only above throws
+            plan.check(extrapolate, index, allow_below=True)
+            return self.__class__._wrap(plan.linterp(self.data))
         return dolinterp
     
+    def slices(
+        self,
+        starts: npt.ArrayLike,
+        stops: npt.ArrayLike,
+        index: TimeIndex | npt.NDArray | pd.Index = None,
+    ) -> list[Self]:
+        """Cut many windows from self at once. starts and stops are fractional indexes, or
+        values in index (e.g. times) if it is given. The rows at fractional ends are linearly
+        interpolated (slerped for Quaternions) in a single pass over all the windows."""
+        starts, stops = np.atleast_1d(starts), np.atleast_1d(stops)
+        if index is not None:
+            index = TimeIndex.build(index, len(self)).index
+            starts = get_index(index, starts)
+            stops = get_index(index, stops)
+        positions = apply_index_slices(np.arange(len(self)), starts, stops)
+        if len(positions) == 0:
+            return []
+        numbers = TimeIndex.build(None, len(self))
+        plan = numbers.plan(np.concatenate(positions))
+        if self.__class__.interpolation_method == "slerp":
+            res = self.slerp(numbers)(plan)
+        else:
+            res = self.__class__._wrap(plan.linterp(self.data))
+        splits = np.cumsum([len(p) for p in positions])[:-1]
+        return [self.__class__._wrap(d) for d in np.split(res.data, splits)]
+
     def bspline(self, index: npt.NDArray | pd.Index = None):
         from scipy.interpolate import make_interp_spline
 
@@ -421,15 +584,7 @@ class Base:
         return lambda i: self.__class__(bspline(i))
 
     def interpolate(self, index: npt.NDArray | pd.Index = None, method:str=None):
-        if method is None:
-            match (self.__class__.__name__):
-                case "Point":
-                    method="bspline"
-                case "Quaternion":
-                    method="slerp"
-                case "Time":
-                    method="linterp"
-        return getattr(self, method)(index)
+        return getattr(self, self.__class__.interpolation_method if method is None else method)(index)
 
     def plot(self, index=None, **kwargs):
         import plotly.graph_objects as go
@@ -446,3 +601,20 @@ class Base:
             )
         # df = self.to_pandas(self.__class__.__name__[0], index=index)
         return fig
+
+
+@array_function(np.concatenate)
+def _concatenate(arrays, axis=0, **kwargs):
+    res = np.concatenate(_unwrap(list(arrays)), axis=axis, **kwargs)
+    first = next(a for a in arrays if isinstance(a, Base))
+    return first._wrap_result(res) if axis == 0 else res
+
+
+@array_function(np.vstack)
+def _vstack(arrays, **kwargs):
+    return _concatenate([a if isinstance(a, Base) else np.atleast_2d(a) for a in arrays], axis=0, **kwargs)
+
+
+@array_function(np.copy)
+def _copy(a, **kwargs):
+    return a.copy()
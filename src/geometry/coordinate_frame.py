@@ -18,6 +18,7 @@ from geometry.base import Base
 
 
 class Coord(Base):
+    __slots__ = ("_origin", "_x_axis", "_y_axis", "_z_axis")
     cols = [
         "ox", "oy", "oz",
         "x1", "y1", "z1",
@@ -25,22 +26,40 @@ class Coord(Base):
         "x3", "y3", "z3",
     ]
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.origin=Point(self.data[:,:3])
-        self.x_axis=Point(self.data[:,3:6])
-        self.y_axis=Point(self.data[:,6:9])
-        self.z_axis=Point(self.data[:,9:12])
+    def _axis(self, slot: str, start: int) -> Point:
+        """the Point at columns start:start+3, created on first access and cached in slot"""
+        try:
+            return getattr(self, slot)
+        except AttributeError:
+            point = Point._wrap(self.data[:, start : start + 3])
+            setattr(self, slot, point)
+            return point
+
+    @property
+    def origin(self) -> Point:
+        return self._axis("_origin", 0)
+
+    @property
+    def x_axis(self) -> Point:
+        return self._axis("_x_axis", 3)
+
+    @property
+    def y_axis(self) -> Point:
+        return self._axis("_y_axis", 6)
+
+    @property
+    def z_axis(self) -> Point:
+        return self._axis("_z_axis", 9)
     
     @staticmethod
     def from_axes(o:Point, x:Point, y:Point, z:Point) -> Coord:
         assert len(o) == len(x) == len(y) == len(z)
-        return Coord(np.concatenate([
+        return Coord._wrap(np.concatenate([
             o.data,
             x.unit().data,
             y.unit().data,
             z.unit().data
-        ],axis=1))
+        ],axis=1, dtype=Coord._dtype))
 
     @staticmethod
     def zero(count=1) -> Coord:
@@ -71,19 +90,28 @@ class Coord(Base):
     def inverse_rotation_matrix(self):
         return Quaternion.from_rotation_matrix(self.rotation_matrix()).inverse().to_rotation_matrix()
 
-    def rotate(self, rotation=Quaternion) -> Coord:
-        return Coord.from_axes(
-            self.origin,
-            rotation.transform_point(self.x_axis),
-            rotation.transform_point(self.y_axis),
-            rotation.transform_point(self.z_axis)
-        )
+    def rotate(self, rotation: Quaternion | np.ndarray) -> Coord:
+        """rotate the axes (not the origin) by a Quaternion or by (3,3) / (N,3,3) row vector
+        rotation matrices, as Quaternion.to_rotation_matrix, in a single matmul"""
+        rmat = rotation.to_rotation_matrix() if isinstance(rotation, Quaternion) else rotation
+        axes = np.matmul(self.data[:, 3:].reshape(-1, 3, 3), rmat)
+        n = len(axes)
+        return Coord._wrap(np.concatenate([
+            np.broadcast_to(self.data[:, :3], (n, 3)),
+            axes.reshape(n, 9)
+        ], axis=1))
 
     def __eq__(self, other):
         return self.data == other.data
 
     def translate(self, point) -> Coord:
-        return Coord.from_axes(self.origin + point, self.x_axis, self.y_axis, self.z_axis)
+        """move the origin, the axes are unchanged"""
+        origin = (self.origin + point).data
+        n = len(origin)
+        return Coord._wrap(np.concatenate([
+            origin,
+            np.broadcast_to(self.data[:, 3:], (n, 9))
+        ], axis=1))
 
     def axes(self):
         return Point.concatenate([self.x_axis, self.y_axis, self.z_axis])
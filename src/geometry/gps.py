@@ -30,47 +30,43 @@ LOCFAC = math.radians(erad)
 
 
 class GPS(Base):
+    __slots__ = ("_longfac_cache",)
     cols = ["lat", "long", "alt"]
+    _dtype = np.float64  # float32 only resolves latitude and longitude to a few metres
     # was 6378137, extra precision removed to match ardupilot
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._longfac = safecos(self.lat)
+    @property
+    def _longfac(self):
+        try:
+            return self._longfac_cache
+        except AttributeError:
+            self._longfac_cache = safecos(self.lat)
+            return self._longfac_cache
 
     def __eq__(self, other) -> bool:
         return np.all(self.data == other.data)
 
     def __sub__(self, other) -> Point:
         assert isinstance(other, GPS), f'Cannot offset a GPS by a {other.__class__.__name__}'
-        if len(other) == len(self):
-            return Point(
-                (self.lat - other.lat) * LOCFAC,
-                (self.long - other.long) * LOCFAC * self._longfac,
-                other.alt - self.alt
-            )
-        elif len(other) == 1:
-            return self - GPS.full(other, len(self))
-        elif len(self) == 1:
-            return GPS.full(self, len(self)) - other
-        else:
+        if len(other) != len(self) and len(other) > 1 and len(self) > 1:
             raise ValueError(f"incompatible lengths for GPS sub ({len(self)}) != ({len(other)})")
+        return Point._wrap(np.column_stack(np.broadcast_arrays(
+            (self.lat - other.lat) * LOCFAC,
+            (self.long - other.long) * LOCFAC * self._longfac,
+            other.alt - self.alt
+        )))
 
     def offset(self, pin: Point):
         '''Offset by a point in NED coordinates'''
-        if len(pin) == 1 and len(self) > 1:
-            pin = Point.full(pin, len(self))
-        elif len(self) == 1 and len(pin) > 1:
-            return GPS.full(self, len(pin)).offset(pin)
-        
-        if not len(pin) == len(self):
+        if len(pin) != len(self) and len(pin) > 1 and len(self) > 1:
             raise ValueError(f"incompatible lengths for GPS offset ({len(self)}) != ({len(pin)})")
 
         latb = self.lat + pin.x / LOCFAC
-        return GPS(
+        return GPS._wrap(np.column_stack(np.broadcast_arrays(
             latb,
             self.long + pin.y / (LOCFAC * safecos(latb)),
             self.alt - pin.z
-        )
+        )))
 
     def bspline(self, index: npt.NDArray | pd.Index = None):
         
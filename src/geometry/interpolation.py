@@ -0,0 +1,146 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+from __future__ import annotations
+from numbers import Number
+from collections import defaultdict
+from typing import Literal, TYPE_CHECKING
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+if TYPE_CHECKING:
+    from geometry.base import Base
+    from geometry.time import Time
+
+
+class TimeIndex:
+    """A monotonic increasing index (times or sample numbers) that is checked once and
+    can then be shared by every series sampled on it."""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: npt.NDArray | pd.Index):
+        from geometry.time import Time
+
+        if isinstance(index, Time):
+            index = index.t
+        self.index = np.asarray(index, dtype=float)
+        if np.any(np.diff(self.index) < 0):
+            raise ValueError("index must be monotonic increasing")
+
+    @staticmethod
+    def build(index: TimeIndex | npt.NDArray | pd.Index | None, length: int) -> TimeIndex:
+        """a TimeIndex for a series of length, sample numbers if index is None"""
+        if not isinstance(index, TimeIndex):
+            index = TimeIndex(np.arange(length) if index is None else index)
+        if len(index) != length:
+            raise ValueError(f"index length {len(index)} does not match series length {length}")
+        return index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def plan(self, ts: npt.NDArray | Number) -> InterpolationPlan:
+        return InterpolationPlan(self, ts)
+
+
+class InterpolationPlan:
+    """The brackets and weights to interpolate any series on a TimeIndex at the times ts,
+    found with a single binary search.
+    i0, i1: the samples either side of each t, equal for an exact match. Outside the
+        range they are both the nearest end.
+    weights: the fraction of the way from i0 to i1.
+    below, above: masks of the ts outside the range of the index.
+    """
+
+    __slots__ = ("index", "ts", "i0", "i1", "weights", "below", "above")
+
+    def __init__(self, index: TimeIndex, ts: npt.NDArray | Number):
+        self.index = index
+        self.ts = np.atleast_1d(np.asarray(ts, dtype=float))
+        idx = index.index
+        right = np.searchsorted(idx, self.ts, side="right")
+        self.below = right == 0
+        i0 = np.maximum(right - 1, 0)
+        exact = idx[i0] == self.ts
+        self.above = (right == len(idx)) & ~exact
+        i1 = np.where(exact | self.below | self.above, i0, np.minimum(right, len(idx) - 1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.weights = np.where(i0 == i1, 0.0, (self.ts - idx[i0]) / (idx[i1] - idx[i0]))
+        self.i0, self.i1 = i0, i1
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @property
+    def exact(self) -> npt.NDArray:
+        return (self.i0 == self.i1) & ~self.below & ~self.above
+
+    def check(
+        self,
+        extrapolate: Literal["throw", "nearest"] = "throw",
+        index: TimeIndex = None,
+        allow_below: bool = False,
+    ):
+        """raise if the plan extrapolates (and extrapolate == "throw") or if it was made
+        for a different index. allow_below only raises for ts above the range."""
+        if index is not None and index is not self.index and not np.array_equal(index.index, self.index.index):
+            raise ValueError("the plan was made for a different index")
+        outside = self.above if allow_below else self.above | self.below
+        if extrapolate == "throw" and np.any(outside):
+            raise Exception("Cannot extrapolate beyond parent range")
+
+    def linterp(self, data: npt.NDArray) -> npt.NDArray:
+        """linearly interpolate the rows of data, holding the end values outside the range"""
+        d0 = data[self.i0]
+        return d0 + (data[self.i1] - d0) * self.weights[:, None].astype(data.dtype, copy=False)
+
+
+def resample(
+    time: Time,
+    target_ts: npt.NDArray,
+    extrapolate: Literal["throw", "nearest"] = "throw",
+    methods: dict[str, str] = None,
+    **series: Base,
+) -> dict[str, Base]:
+    """Interpolate several series that share time onto target_ts.
+    The brackets and weights are found once. The method for each series is its class's
+    interpolation_method unless it is given in methods. Series with the same method are
+    stacked and interpolated together. Returns a dict of the resampled series and "time".
+    """
+    index = TimeIndex(time)
+    plan = index.plan(target_ts)
+    plan.check(extrapolate, index)
+
+    groups = defaultdict(list)
+    for name, s in series.items():
+        if len(s) != len(index):
+            raise ValueError(f"{name} has length {len(s)}, expected {len(index)}")
+        groups[(methods or {}).get(name, s.interpolation_method)].append(name)
+
+    res = {"time": time.linterp(index, extrapolate)(plan)}
+    for method, names in groups.items():
+        if method == "linterp" or method == "bspline":
+            stacked = np.concatenate([series[n].data for n in names], axis=1)
+            if method == "linterp":
+                odata = plan.linterp(stacked)
+            else:
+                from scipy.interpolate import make_interp_spline
+
+                odata = make_interp_spline(index.index, stacked, axis=0)(plan.ts).astype(stacked.dtype, copy=False)
+            splits = np.cumsum([series[n].data.shape[1] for n in names])[:-1]
+            for name, data in zip(names, np.split(odata, splits, axis=1)):
+                res[name] = series[name].__class__._wrap(data)
+        else:
+            for name in names:
+                res[name] = getattr(series[name], method)(index, extrapolate)(plan)
+    return res
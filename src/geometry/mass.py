@@ -3,6 +3,7 @@ import numpy as np
 
 
 class Mass(Base):
+    __slots__ = ()
     cols = ["m", "xx", "xy", "xz", "yx", "yy", "yz", "zx", "zy", "zz"]
 
     @staticmethod
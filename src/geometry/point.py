@@ -21,7 +21,9 @@ import numpy.typing as npt
 
 
 class Point(Base):
+    __slots__ = ()
     cols = ["x", "y", "z"]
+    interpolation_method = "bspline"
     from_np = [
         "sin",
         "cos",
@@ -33,15 +35,15 @@ class Point(Base):
 
     @property
     def xy(self):
-        return Point(self.x, self.y, np.zeros(len(self)))
+        return Point._wrap(np.column_stack([self.x, self.y, np.zeros(len(self))]))
 
     @property
     def yz(self):
-        return Point(np.zeros(len(self)), self.y, self.z)
+        return Point._wrap(np.column_stack([np.zeros(len(self)), self.y, self.z]))
 
     @property
     def zx(self):
-        return Point(self.x, np.zeros(len(self)), self.z)
+        return Point._wrap(np.column_stack([self.x, np.zeros(len(self)), self.z]))
 
     def scale(self, value) -> Point:
         with np.errstate(divide="ignore"):
@@ -61,26 +63,26 @@ class Point(Base):
 
         data[abs(ab - mean) > nstds * std, :] = [np.nan, np.nan, np.nan]
 
-        return Point(pd.DataFrame(data).ffill().bfill().to_numpy())
+        return Point._wrap(pd.DataFrame(data).ffill().bfill().to_numpy())
 
     def mean(self):
-        return Point(np.mean(self.data, axis=0))
+        return Point._wrap(np.mean(self.data, axis=0).reshape(1, 3))
 
     def max(self):
-        return Point(np.max(self.data, axis=0))
+        return Point._wrap(np.max(self.data, axis=0).reshape(1, 3))
 
     def min(self):
-        return Point(np.min(self.data, axis=0))
+        return Point._wrap(np.min(self.data, axis=0).reshape(1, 3))
 
     def angles(self, p2):
         return (self.cross(p2) / (abs(self) * abs(p2))).arcsin
 
     def planar_angles(self):
-        return Point(
+        return Point._wrap(np.column_stack([
             np.arctan2(self.y, self.z),
             np.arctan2(self.z, self.x),
             np.arctan2(self.x, self.y),
-        )
+        ]))
 
     def angle(self, p2):
         return abs(Point.angles(self, p2))
@@ -97,45 +99,50 @@ class Point(Base):
     def Z(value=1, count=1):
         return np.tile(value, count) * Point(0, 0, 1)
 
-    def rotate(self, rmat=np.ndarray):
-        if len(rmat.shape) == 3:
-            pass
-        elif len(rmat.shape) == 2:
-            rmat = np.reshape(rmat, (1, 3, 3))
-        else:
-            raise TypeError("expected a 3x3 matrix")
-
-        return self.dot(rmat)
-
-    def to_rotation_matrix(self):
-        """returns the rotation matrix based on a point representing Euler angles"""
-        s = self.sin
-        c = self.cos
-        return np.transpose(
-            np.array(
-                [
-                    [
-                        c.z * c.y,
-                        c.z * s.y * s.x - c.x * s.z,
-                        c.x * c.z * s.y + s.x * s.z,
-                    ],
-                    [
-                        c.y * s.z,
-                        c.x * c.z + s.x * s.y * s.z,
-                        -1 * c.z * s.x + c.x * s.y * s.z,
-                    ],
-                    [-1 * s.y, c.y * s.x, c.x * c.y],
-                ]
-            ),
-            (2, 0, 1),
-        )
+    def rotate(self, rmat: npt.NDArray, out: npt.NDArray = None) -> Point:
+        """Rotate by a (3,3) or (N,3,3) stack of matrices with a single matmul, p @ rmat.
+        The matrices are for row vectors, as returned by Quaternion.to_rotation_matrix,
+        so p.rotate(q.to_rotation_matrix()) == q.transform_point(p). The matrices from
+        Point.to_rotation_matrix are for column vectors, use np.swapaxes(rmat, -1, -2).
+        Points and matrices broadcast against each other, the result can be written to out."""
+        rmat = np.asarray(rmat)
+        if rmat.shape[-2:] != (3, 3) or rmat.ndim > 3:
+            raise TypeError("expected a 3x3 matrix or an Nx3x3 array of matrices")
+        if rmat.ndim == 2:
+            return Point._wrap(np.matmul(self.data, rmat, out=out))
+        if len(self) != len(rmat) and 1 not in (len(self), len(rmat)):
+            raise TypeError(f"cannot rotate {len(self)} points by {len(rmat)} matrices")
+        if out is None:
+            out = np.empty((max(len(self), len(rmat)), 3), dtype=np.result_type(self.data, rmat))
+        np.matmul(self.data[:, None, :], rmat, out=out[:, None, :])
+        return Point._wrap(out)
+
+    def to_rotation_matrix(self, out: npt.NDArray = None) -> npt.NDArray:
+        """returns the rotation matrix based on a point representing Euler angles
+        as a C contiguous (N,3,3) array, written into out if it is provided"""
+        s = np.sin(self.data)
+        c = np.cos(self.data)
+        sx, sy, sz = s.T
+        cx, cy, cz = c.T
+        if out is None:
+            out = np.empty((len(self), 3, 3), dtype=self.data.dtype)
+        out[:, 0, 0] = cz * cy
+        out[:, 0, 1] = cz * sy * sx - cx * sz
+        out[:, 0, 2] = cx * cz * sy + sx * sz
+        out[:, 1, 0] = cy * sz
+        out[:, 1, 1] = cx * cz + sx * sy * sz
+        out[:, 1, 2] = -1 * cz * sx + cx * sy * sz
+        out[:, 2, 0] = -1 * sy
+        out[:, 2, 1] = cy * sx
+        out[:, 2, 2] = cx * cy
+        return out
 
     def matrix(self):
         return np.einsum("i...,...->i...", self.data, np.identity(3))
 
     @staticmethod
     def from_matrix(matrix):
-        return Point(matrix[:, 0, 0], matrix[:, 1, 1], matrix[:, 2, 2])
+        return Point._wrap(np.column_stack([matrix[:, 0, 0], matrix[:, 1, 1], matrix[:, 2, 2]]))
 
     def skew_symmetric(self):
         o = np.zeros(len(self))
@@ -148,7 +155,7 @@ class Point(Base):
 
     @staticmethod
     def zeros(count=1):
-        return Point(np.zeros((count, 3)))
+        return Point._wrap(np.zeros((count, 3), dtype=Point._dtype))
 
     @staticmethod
     def circle_xy(radius: float, n: int) -> Point:
@@ -218,10 +225,7 @@ class Point(Base):
         )
     def arbitrary_perpendicular(self) -> Point:
         min_axes = np.argmin(np.abs(self.data), axis=1)
-        cvecs = Point.concatenate(
-            [Point(*[1 if axis == i else 0 for i in np.arange(3)]) for axis in min_axes]
-        )
-        return cross(self, cvecs)
+        return cross(self, Point._wrap(np.identity(3, dtype=self.data.dtype)[min_axes]))
 
 
 def Points(*args, **kwargs):
@@ -257,7 +261,7 @@ def ppmeth(func):
 
 @ppmeth
 def cross(a: Point, b: Point) -> Point:
-    return Point(np.cross(a.data, b.data))
+    return Point._wrap(np.cross(a.data, b.data))
 
 
 @ppmeth
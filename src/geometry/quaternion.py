@@ -12,21 +12,94 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 from __future__ import annotations
 from .point import Point
 from .base import Base
+from .interpolation import TimeIndex, InterpolationPlan
 from geometry.point import PZ
 import numpy as np
 import numpy.typing as npt
 import pandas as pd
 from warnings import warn
 from numbers import Number
-from typing import Callable, Literal
+from typing import Callable, Literal, Iterable, Iterator
+
+
+def quaternion_product(
+    a: npt.NDArray, b: npt.NDArray, out: npt.NDArray = None
+) -> npt.NDArray:
+    """Hamilton product of two (N,4) arrays of quaternions in w, x, y, z order.
+    either input can have length 1, in which case it is applied to every row of the other.
+    out can be a preallocated (N,4) array to write the result into, it may be a or b.
+    """
+    if len(a) != len(b) and len(a) > 1 and len(b) > 1:
+        raise TypeError(
+            f"lengths of passed arguments must be equal or 1, got {len(a)}, {len(b)}"
+        )
+    aw, ax, ay, az = a[:, 0], a[:, 1], a[:, 2], a[:, 3]
+    bw, bx, by, bz = b[:, 0], b[:, 1], b[:, 2], b[:, 3]
+    return np.stack(
+        [
+            aw * bw - ax * bx - ay * by - az * bz,
+            aw * bx + ax * bw + ay * bz - az * by,
+            aw * by - ax * bz + ay * bw + az * bx,
+            aw * bz + ax * by - ay * bx + az * bw,
+        ],
+        axis=1,
+        out=out,
+    )
+
+
+def quaternion_rotate(
+    q: npt.NDArray, v: npt.NDArray, normalized: bool = False, out: npt.NDArray = None
+) -> npt.NDArray:
+    """Rotate an (N,3) array of vectors by an (N,4) array of quaternions (w, x, y, z),
+    using v + 2w(q x v) + 2q x (q x v). Either input can have length 1.
+    set normalized=True to skip the renormalisation if q is already unit length.
+    """
+    if len(q) != len(v) and len(q) > 1 and len(v) > 1:
+        raise TypeError(
+            f"lengths of passed arguments must be equal or 1, got {len(q)}, {len(v)}"
+        )
+    if not normalized:
+        q = q / np.linalg.norm(q, axis=1, keepdims=True)
+    u = q[:, 1:]
+    t = 2 * np.cross(u, v)
+    res = v + q[:, :1] * t + np.cross(u, t)
+    if out is None:
+        return res
+    out[:] = res
+    return out
+
+
+def _euler_sequence(sequence: str) -> tuple[list[int], bool]:
+    """axis indices of an Euler sequence and whether it is proper Euler (e.g. zxz)"""
+    if len(sequence) != 3 or any(a not in "xyz" for a in sequence) or any(
+        sequence[i] == sequence[i + 1] for i in range(2)
+    ):
+        raise ValueError(f"invalid Euler sequence {sequence}")
+    return ["xyz".index(a) for a in sequence], sequence[0] == sequence[2]
+
+
+def quaternion_log(q: npt.NDArray, shortest: bool = True) -> npt.NDArray:
+    """Axis * angle (N,3) of an (N,4) array of quaternions (w, x, y, z).
+    angle = 2 atan2(|xyz|, w), which is stable for all angles and independent of the norm.
+    if shortest, quaternions with negative w are flipped first so the angle is at most pi.
+    """
+    w, v = q[:, :1], q[:, 1:]
+    if shortest:
+        flip = w < 0
+        w, v = np.where(flip, -w, w), np.where(flip, -v, v)
+    n = np.linalg.norm(v, axis=1, keepdims=True)
+    angle = 2 * np.arctan2(n, w)
+    return v * np.divide(angle, n, out=np.zeros_like(n), where=n > 0)
 
 
 class Quaternion(Base):
+    __slots__ = ()
     cols=["w", "x", "y", "z"]
+    interpolation_method = "slerp"
 
     @staticmethod
     def zero(count=1) -> Quaternion:
-        return Quaternion(np.tile([1,0,0,0], (count,1)))
+        return Quaternion._wrap(np.tile(np.array([1, 0, 0, 0], dtype=Quaternion._dtype), (count, 1)))
 
     @property
     def xyzw(self):
@@ -34,125 +107,143 @@ class Quaternion(Base):
 
     @property
     def axis(self) -> Point:
-        return Point(self.data[:,1:])
+        return Point._wrap(self.data[:, 1:])
 
     def norm(self) -> Quaternion:
         return self / abs(self)
 
     def conjugate(self) -> Quaternion:
-        return Quaternion(self.w, -self.x, -self.y, -self.z)
+        data = self.data.copy()
+        np.negative(data[:, 1:], out=data[:, 1:])
+        return Quaternion._wrap(data)
 
     def inverse(self):
         return self.conjugate().norm()
 
     def __mul__(self, other: Number | Quaternion | npt.NDArray) -> Quaternion:
         if isinstance(other, Quaternion):
-            a, b = Quaternion.length_check(self, Quaternion.type_check(other))
-            w = a.w * b.w - a.axis.dot(b.axis)
-            xyz = a.w * b.axis + b.w * a.axis + a.axis.cross(b.axis)
-            return Quaternion(np.column_stack([w, xyz.data]))
-
-        elif isinstance(other, Number):
-            return Quaternion(self.data * other)
-        elif isinstance(other, np.ndarray):
-            return Quaternion(self.data * self._dprep(other))
-                        
+            return Quaternion._wrap(quaternion_product(self.data, other.data))
+
+        elif isinstance(other, Number) or isinstance(other, np.ndarray):
+            return self._binary(np.multiply, other)
+
         raise TypeError(f"cant multiply a quaternion by a {other.__class__.__name__}")
 
     def __rmul__(self, other) -> Quaternion:
         #either it should have been picked up by the left hand object or it should commute
         return self * other   
 
-    def transform_point(self, point: Point) -> Point:
-        '''Transform a point by the rotation described by self'''
-        a, b = Base.length_check(self, point)
-        
-        qdata = np.column_stack((np.zeros(len(a)), b.data))
-
-        return (a * Quaternion(qdata) * a.inverse()).axis
+    def transform_point(self, point: Point, normalized: bool = False) -> Point:
+        '''Transform a point by the rotation described by self,
+        set normalized=True to skip the normalisation if self is already unit length'''
+        return Point._wrap(quaternion_rotate(self.data, point.data, normalized))
   
     @staticmethod
-    def from_euler(eul: Point) -> Quaternion:
-        '''Create a quaternion from a Point of Euler angles order z, y, x'''
-        eul = Point.type_check(eul).unwrap()
+    def from_euler(eul: Point, sequence: str = "zyx", out: npt.NDArray = None) -> Quaternion:
+        """Create a quaternion from a Point of Euler angles.
+        sequence is the order the intrinsic rotations are applied in (default z, y, x).
+        For Tait-Bryan sequences the angle about each axis is in the corresponding
+        component of eul (x=roll, y=pitch, z=yaw for zyx), for proper Euler sequences
+        (e.g. zxz) the components are the first, second and third angles."""
+        axes, proper = _euler_sequence(sequence)
+        eul = np.unwrap(Point.type_check(eul).data, axis=0)
+        if out is None:
+            out = np.empty((len(eul), 4), dtype=Quaternion._dtype)
         half = eul * 0.5
-        c = half.cos
-        s = half.sin
-
-        return Quaternion(
-            np.array([
-                c.y * c.z * c.x + s.y * s.z * s.x,
-                c.y * c.z * s.x - s.y * s.z * c.x,
-                s.y * c.z * c.x + c.y * s.z * s.x,
-                c.y * s.z * c.x - s.y * c.z * s.x
-            ]).T
-        )
-
-    def to_euler(self) -> Point:
-        '''Create a Point of Euler angles order z,y,x'''
-        sinr_cosp = 2 * (self.w * self.x + self.y * self.z)
-        cosr_cosp = 1 - 2 * (self.x * self.x + self.y * self.y)
-        roll = np.arctan2(sinr_cosp, cosr_cosp)
-
-        sinp = 2 * (self.w * self.y - self.z * self.x)
-        with np.errstate(invalid='ignore'):
-            pitch = np.arcsin(sinp)
-                
-        siny_cosp = 2 * (self.w * self.z + self.x * self.y)
-        cosy_cosp = 1 - 2 * (self.y * self.y + self.z * self.z)
-        yaw = np.arctan2(siny_cosp, cosy_cosp)
-
-        test = np.abs(sinp) >= 0.9999
-        if len(sinp[test]) > 0:
-            pitch[test] = np.copysign(np.pi / 2, sinp[test])
-            yaw[test] = np.zeros(len(sinp[test]))
-
-            roll[test] = 2* np.arctan2(self.x[test],self.w[test])
-        return Point(roll, pitch, yaw)
+        c = np.cos(half)
+        s = np.sin(half)
+        if sequence == "zyx":
+            cx, cy, cz = c.T
+            sx, sy, sz = s.T
+            cycz, sysz, sycz, cysz = cy * cz, sy * sz, sy * cz, cy * sz
+            out[:, 0] = cycz * cx + sysz * sx
+            out[:, 1] = cycz * sx - sysz * cx
+            out[:, 2] = sycz * cx + cysz * sx
+            out[:, 3] = cysz * cx - sycz * sx
+        else:
+            elementary = np.zeros((3, len(eul), 4))
+            for i, axis in enumerate(axes):
+                col = i if proper else axis
+                elementary[i, :, 0] = c[:, col]
+                elementary[i, :, axis + 1] = s[:, col]
+            quaternion_product(
+                quaternion_product(elementary[0], elementary[1]), elementary[2], out=out
+            )
+        return Quaternion._wrap(out)
+
+    def to_euler(self, sequence: str = "zyx", out: npt.NDArray = None) -> Point:
+        """Create a Point of Euler angles, see from_euler for the sequence and layout.
+        At gimbal lock one angle is set to zero, the yaw for zyx and the third rotation
+        for the other sequences."""
+        axes, proper = _euler_sequence(sequence)
+        if out is None:
+            out = np.empty((len(self), 3), dtype=self.data.dtype)
+        w, x, y, z = self.data.T
+        if sequence == "zyx":
+            sinp = 2 * (w * y - z * x)
+            np.arctan2(2 * (w * x + y * z), 1 - 2 * (x * x + y * y), out=out[:, 0])
+            np.arcsin(np.clip(sinp, -1, 1), out=out[:, 1])
+            np.arctan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z), out=out[:, 2])
+
+            test = np.abs(sinp) >= 0.9999
+            if test.any():
+                out[test, 0] = 2 * np.arctan2(x[test], w[test])
+                out[test, 1] = np.copysign(np.pi / 2, sinp[test])
+                out[test, 2] = 0
+            return Point._wrap(out)
+
+        # Bernardes & Viollet (2022), on the equivalent extrinsic sequence (axes reversed)
+        i, j, k = axes[::-1]
+        if proper:
+            k = 3 - i - j
+        sign = (i - j) * (j - k) * (k - i) // 2
+        v = self.data[:, 1:]
+        if proper:
+            a, b, c, d = w, v[:, i], v[:, j], v[:, k] * sign
+        else:
+            a, b = w - v[:, j], v[:, i] + v[:, k] * sign
+            c, d = v[:, j] + w, v[:, k] * sign - v[:, i]
+
+        second = 2 * np.arctan2(np.hypot(c, d), np.hypot(a, b))
+        half_sum = np.arctan2(b, a)
+        half_diff = np.arctan2(d, c)
+        eps = 1e-7
+        lock_sum = np.abs(second) <= eps
+        lock_diff = np.abs(second - np.pi) <= eps
+        locked = lock_sum | lock_diff
+        first = np.where(locked, 0, half_sum - half_diff)
+        third = np.where(lock_sum, 2 * half_sum, np.where(lock_diff, 2 * half_diff, half_sum + half_diff))
+        if not proper:
+            third = third * sign
+            second = second - np.pi / 2
+
+        # first and third are the first and last extrinsic angles, i.e. the last and first intrinsic
+        cols = [0, 1, 2] if proper else axes
+        for col, angle in zip(cols, [third, second, first]):
+            out[:, col] = angle
+        out[:] = (out + np.pi) % (2 * np.pi) - np.pi
+        return Point._wrap(out)
 
     @staticmethod
     def from_axis_angle(axangles: Point) -> Quaternion:
+        """Create quaternions from a Point of axis * angle.
+        sin(angle/2) / angle is evaluated with np.sinc, which is finite at zero, so every
+        row is computed in one pass. Rotations smaller than 1e-6 rad give the identity."""
         small = 1e-6
-        angles = abs(axangles)
-
-        qdat = np.tile(np.array([1.0, 0.0, 0.0, 0.0]), (len(angles), 1))
-
-        if angles.any() >= small:
-            baxangles = Point(axangles.data[angles >= small])
-            bangles = angles[angles >= small]
-
-            s = np.sin(bangles/2)
-            c = np.cos(bangles/2)
-            axis = baxangles / bangles
-
-            qdat[angles >= small] = np.array([
-                c, axis.x * s, axis.y * s, axis.z * s
-            ]).T
-
-        #qdat[abs(Quaternions(qdat)) < .001] = np.array([[1, 0, 0, 0]])
-        return Quaternion(qdat)
+        angles = np.linalg.norm(axangles.data, axis=1, keepdims=True)
+        snap = angles < small
+        return Quaternion._wrap(np.concatenate([
+            np.where(snap, 1, np.cos(angles / 2)),
+            axangles.data * np.where(snap, 0, 0.5 * np.sinc(angles / (2 * np.pi)))
+        ], axis=1))
 
     def to_axis_angle(self) -> Point:
-        a = self._to_axis_angle()
-        b = (-self)._to_axis_angle()
-
-        res = a.data
-        replocs = abs(a)>abs(b)
-        res[replocs, :] = b.data[replocs, :]
-
-        return Point(res)
+        """to a point of axis angles, taking the shortest rotation (angle <= pi)"""
+        return Point._wrap(quaternion_log(self.data, shortest=True))
 
     def _to_axis_angle(self) -> Point:
-        """to a point of axis angles. must be normalized first."""
-        angle = 2 * np.arccos(self.w)
-        s = np.sqrt(1 - self.w**2)
-        np.array(s)[np.array(s) < 1e-6] = 1.0
-        with np.errstate(divide="ignore", invalid='ignore'):
-            sangle = angle / s
-            sangle[sangle==np.inf] = 0
-            sangle[np.isnan(sangle)] = 0
-        res = self.axis * sangle
-        return res
+        """to a point of axis angles, angle is in the range 0 to 2 pi"""
+        return Point._wrap(quaternion_log(self.data, shortest=False))
 
     @staticmethod
     def axis_rates(q: Quaternion, qdot: Quaternion) -> Point:
@@ -187,11 +278,8 @@ class Quaternion(Base):
         assert len(dt) == len(self)
         dt = dt * len(dt) / (len(dt) - 1)
 
-        ps = Quaternion._axis_rates(
-            Quaternion(self.data[:-1, :]),
-            Quaternion(self.data[1:, :])
-        ) / dt[:-1]
-        return Point(np.vstack([ps.data, ps.data[-1,:]]))
+        ps = Quaternion._pair_rates(self.data, dt, body=False)
+        return Point._wrap(np.vstack([ps.data, ps.data[-1,:]]))
 
     def body_diff(self, dt: Number | npt.NDArray = None) -> Point:
         """differentiate in the body frame"""
@@ -200,50 +288,113 @@ class Quaternion(Base):
         assert len(dt) == len(self)
         dt = dt * len(dt) / (len(dt) - 1)
 
-        ps = Quaternion.body_axis_rates(
-            Quaternion(self.data[:-1, :]),
-            Quaternion(self.data[1:, :])
-        ) / dt[:-1]
-        return Point(np.vstack([ps.data, ps.data[-1,:]]))
+        ps = Quaternion._pair_rates(self.data, dt, body=True)
+        return Point._wrap(np.vstack([ps.data, ps.data[-1,:]]))
+
+    @staticmethod
+    def _pair_rates(data: npt.NDArray, dt: npt.NDArray, body: bool) -> Point:
+        """rates between consecutive rows of data, dt has one value per row"""
+        a, b = Quaternion._wrap(data[:-1, :]), Quaternion._wrap(data[1:, :])
+        if body:
+            return Quaternion.body_axis_rates(a, b) / dt[:-1]
+        else:
+            return Quaternion._axis_rates(a, b) / dt[:-1]
+
+    @staticmethod
+    def stream_diff(
+        chunks: Iterable[tuple[Quaternion, Number | npt.NDArray]],
+        count: int = None,
+        body: bool = False,
+    ) -> Iterator[Point]:
+        """differentiate quaternions that arrive in chunks, for example from a log reader.
+        chunks yields (Quaternion, dt) pairs, dt is a number or one value per sample.
+        Only the last sample of each chunk is kept between chunks. The rate for a sample needs
+        the sample after it, so the output lags the input by one sample and the final rate,
+        repeated from the one before as in diff, is yielded once the chunks run out.
+        diff scales dt by count / (count - 1). Pass the total number of samples as count to
+        do the same, the concatenated output is then identical to diff (or body_diff if body).
+        """
+        prev_q, prev_dt, last = None, None, None
+        for q, dt in chunks:
+            if len(q) == 0:
+                continue
+            if not pd.api.types.is_list_like(dt):
+                dt = np.full(len(q), 1 if not dt else dt)
+            if count is not None:
+                dt = dt * count / (count - 1)
+            if prev_q is not None:
+                qdata = np.concatenate([prev_q, q.data])
+                dt = np.concatenate([prev_dt, dt])
+            else:
+                qdata = q.data
+            if len(qdata) > 1:
+                ps = Quaternion._pair_rates(qdata, dt, body)
+                last = ps.data[-1:, :]
+                yield ps
+            # copies, readers often refill the same buffers for each chunk
+            prev_q, prev_dt = qdata[-1:, :].copy(), np.array(dt[-1:])
+        if last is not None:
+            yield Point._wrap(last.copy())
 
     
-    def to_rotation_matrix(self) -> npt.NDArray[np.float64]:
+    def to_rotation_matrix(self, out: npt.NDArray = None, normalized: bool = False) -> npt.NDArray[np.float64]:
         """http://en.wikipedia.org/wiki/Quaternions_and_spatial_rotation
         https://github.com/mortlind/pymath3d/blob/master/math3d/quaternion.py
+        Returns a C contiguous (N,3,3) array, written into out if it is provided.
+        The matrices are for row vectors (p @ M), so they are the transpose of the
+        standard rotation matrix. Pass normalized=True to skip normalising the quaternions.
         """
-        n = self.norm()
-        s, x, y, z = n.w, n.x, n.y, n.z
-        x2, y2, z2 = n.x**2, n.y**2, n.z**2
-        return np.array([
-            [1 - 2 * (y2 + z2), 2 * x * y - 2 * s * z, 2 * s * y + 2 * x * z],
-            [2 * x * y + 2 * s * z, 1 - 2 * (x2 + z2), -2 * s * x + 2 * y * z],
-            [-2 * s * y + 2 * x * z, 2 * s * x + 2 * y * z, 1 - 2 * (x2 + y2)]
-        ]).T
+        q = self.data if normalized else self.data / np.linalg.norm(self.data, axis=1, keepdims=True)
+        if out is None:
+            out = np.empty((len(q), 3, 3), dtype=q.dtype)
+        s, x, y, z = q.T
+        x2, y2, z2 = x * x, y * y, z * z
+        xy, xz, yz = x * y, x * z, y * z
+        sx, sy, sz = s * x, s * y, s * z
+        out[:, 0, 0] = 1 - 2 * (y2 + z2)
+        out[:, 0, 1] = 2 * (xy + sz)
+        out[:, 0, 2] = 2 * (xz - sy)
+        out[:, 1, 0] = 2 * (xy - sz)
+        out[:, 1, 1] = 1 - 2 * (x2 + z2)
+        out[:, 1, 2] = 2 * (yz + sx)
+        out[:, 2, 0] = 2 * (sy + xz)
+        out[:, 2, 1] = 2 * (yz - sx)
+        out[:, 2, 2] = 1 - 2 * (x2 + y2)
+        return out
 
     @staticmethod
     def from_rotation_matrix(matrix: npt.NDArray[np.float64]) -> Quaternion:
+        """Create quaternions from a (3,3) matrix or an (N,3,3) stack of matrices.
+        For each matrix the formula is picked from the sign of the diagonal so that the
+        square root is taken of the largest available term, which keeps it stable near
+        180 degree rotations."""
         # This method assumes row-vector and postmultiplication of that vector
-        m = matrix.conj().transpose()
-        if m[2, 2] < 0:
-            if m[0, 0] > m[1, 1]:
-                t = 1 + m[0, 0] - m[1, 1] - m[2, 2]
-                q = [m[1, 2] - m[2, 1], t, m[0, 1] + m[1, 0], m[2, 0] + m[0, 2]]
-            else:
-                t = 1 - m[0, 0] + m[1, 1] - m[2, 2]
-                q = [m[2, 0] - m[0, 2], m[0, 1] +
-                     m[1, 0], t, m[1, 2] + m[2, 1]]
-        else:
-            if m[0, 0] < -m[1, 1]:
-                t = 1 - m[0, 0] - m[1, 1] + m[2, 2]
-                q = [m[0, 1] - m[1, 0], m[2, 0] +
-                     m[0, 2], m[1, 2] + m[2, 1], t]
-            else:
-                t = 1 + m[0, 0] + m[1, 1] + m[2, 2]
-                q = [t, m[1, 2] - m[2, 1], m[2, 0] - m[0, 2], m[0, 1] - m[1, 0]]
-
-        q = np.array(q).astype('float64')
-        q *= 0.5 / np.sqrt(t)
-        return Quaternion(*q)
+        m = np.swapaxes(np.reshape(matrix, (-1, 3, 3)), 1, 2).conj()
+        m00, m01, m02 = m[:, 0, 0], m[:, 0, 1], m[:, 0, 2]
+        m10, m11, m12 = m[:, 1, 0], m[:, 1, 1], m[:, 1, 2]
+        m20, m21, m22 = m[:, 2, 0], m[:, 2, 1], m[:, 2, 2]
+
+        cases = [
+            (m22 < 0) & (m00 > m11),
+            (m22 < 0) & (m00 <= m11),
+            (m22 >= 0) & (m00 < -m11),
+        ]
+        t = np.select(
+            cases,
+            [1 + m00 - m11 - m22, 1 - m00 + m11 - m22, 1 - m00 - m11 + m22],
+            1 + m00 + m11 + m22,
+        )
+        q = np.select(
+            [c[:, None] for c in cases],
+            [
+                np.column_stack([m12 - m21, t, m01 + m10, m20 + m02]),
+                np.column_stack([m20 - m02, m01 + m10, t, m12 + m21]),
+                np.column_stack([m01 - m10, m20 + m02, m12 + m21, t]),
+            ],
+            np.column_stack([t, m12 - m21, m20 - m02, m01 - m10]),
+        )
+        q *= (0.5 / np.sqrt(t))[:, None]
+        return Quaternion._wrap(q.astype(Quaternion._dtype, copy=False))
 
     def closest_principal(self) -> Quaternion:
         eul = self.to_euler()
@@ -259,44 +410,23 @@ class Quaternion(Base):
             p = Point.X()
         return self.transform_point(p).bearing()
     
-    def slerp(self, index: pd.Index | npt.NDArray = None, extrapolate:Literal["throw", "nearest"]="throw"):
-        index = pd.Index(np.arange(len(self)) if index is None else index)
-
-        assert len(index) == len(self)
-        assert pd.Index(index).is_monotonic_increasing
+    def slerp(self, index: TimeIndex | pd.Index | npt.NDArray = None, extrapolate:Literal["throw", "nearest"]="throw"):
+        """spherical linear interpolation, the returned function takes the times to
+        interpolate at or an InterpolationPlan made from the same index"""
+        index = TimeIndex.build(index, len(self))
         from rowan.interpolate import slerp
-        def doslerp(ts: npt.NDArray | Number) -> Quaternion:
-            starts = index.get_indexer(ts, method='ffill')
-            stops = index.get_indexer(ts, method='bfill')
-            
-            #case interpolate match (start == stop - 1)
-            odata = slerp(
-                self[starts].to_numpy("xyzw"),
-                self[stops].to_numpy("xyzw"),
-                (ts - index[starts]) / (index[stops] - index[starts]),
-                True 
-            )
+        def doslerp(ts: npt.NDArray | Number | InterpolationPlan) -> Quaternion:
+            plan = ts if isinstance(ts, InterpolationPlan) else index.plan(ts)
+            plan.check(extrapolate, index)
+            xyzw = self.to_numpy("xyzw")
+
+            odata = slerp(xyzw[plan.i0], xyzw[plan.i1], plan.weights, True)
+
+            #exact matches and ends (i0 == i1) are copied
+            exacts = plan.i0 == plan.i1
+            odata[exacts] = xyzw[plan.i0[exacts]]
 
-            #case exact match (start == stop)
-            exacts = starts == stops
-            odata[exacts] = self.to_numpy("xyzw")[starts[exacts]]
-
-            #case outside range above (start == index[-1], stop== -1)
-            aboves = stops==-1
-            if np.any(aboves):
-                if extrapolate=="throw":
-                    raise Exception("Cannot slerp beyond range")
-                else:
-                    odata[aboves] = self.to_numpy("xyzw")[-1, :]
-            #case outside range below (start == -1, stop==index[0])
-            belows = starts==-1
-            if np.any(belows):
-                if extrapolate=="throw":
-                    raise Exception("Cannot slerp beyond range")
-                else:
-                    odata[belows] = self.to_numpy("xyzw")[0, :]
-
-            return Quaternion.from_numpy( odata, "xyzw")
+            return Quaternion.from_numpy(odata.astype(self.data.dtype, copy=False), "xyzw")
             
         return doslerp
 
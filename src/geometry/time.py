@@ -7,10 +7,13 @@ import numpy.typing as npt
 import pandas as pd
 from time import time
 from geometry.utils import get_index
+from geometry.interpolation import TimeIndex, InterpolationPlan
 
 
 class Time(Base):
+    __slots__ = ()
     cols = ["t", "dt"]
+    _dtype = np.float64  # float32 cannot resolve timestamps to better than minutes
 
     @staticmethod
     def from_t(t: np.ndarray) -> Time:
@@ -51,25 +54,21 @@ class Time(Base):
 
     def linterp(
         self,
-        index: npt.NDArray | pd.Index,
+        index: TimeIndex | npt.NDArray | pd.Index,
         extrapolate: Literal["throw", "nearest"] = "throw",
     ):
-        """linear interpolation between two times"""
-        index = pd.Index(np.arange(len(self)) if index is None else index)
-        assert len(index) == len(self)
-        assert pd.Index(index).is_monotonic_increasing
+        """linear interpolation between two times, the returned function takes the times
+        to interpolate at or an InterpolationPlan made from the same index"""
+        index = TimeIndex.build(index, len(self))
 
-        def dolinterp(ts: npt.NDArray | pd.Index):
-            starts = index.get_indexer(ts, method="ffill")
-            stops = index.get_indexer(ts, method="bfill")
-            if np.any(starts * stops < 0) and extrapolate == "throw":
-                raise Exception("Cannot extrapolate beyond parent range")
+        def dolinterp(ts: npt.NDArray | pd.Index | InterpolationPlan):
+            plan = ts if isinstance(ts, InterpolationPlan) else index.plan(ts)
+            # linterp has always held the first value below the range, only above throws
+            plan.check(extrapolate, index, allow_below=True)
 
-            new_time = Time.from_t(
-                np.interp(ts, index, self.t, self.t[0], self.t[-1])
-            )
+            new_time = Time.from_t(plan.linterp(self.data[:, :1])[:, 0])
 
-            last_p = self[stops][-1]
+            last_p = self[plan.i1[-1]]
             if last_p.t[0] == new_time.t[-1]:
                 last_dt = last_p.dt[-1]
             else:
@@ -11,12 +11,14 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 """
 from __future__ import annotations
 from geometry import Base, Point, Quaternion, P0, Q0, Coord
+from geometry.quaternion import quaternion_product, quaternion_rotate
 
 import numpy as np
 from typing import Self, Literal
 
 
 class Transformation(Base):
+    __slots__ = ("_compiled",)
     cols = ["x", "y", "z", "rw", "rx", "ry", "rz"]
 
     def __init__(self, *args, **kwargs):
@@ -36,37 +38,29 @@ class Transformation(Base):
 
     @property
     def p(self):
-        return Point(self.data[:,:3])
+        return Point._wrap(self.data[:, :3])
 
     @property
     def q(self):    
-        return Quaternion(self.data[:,3:])
-
-    def __getattr__(self, name):
-        if name in list("xyz"):
-            return getattr(self.translation, name)
-        elif len(name) == 2 and name[0] == "r":
-            if name[1] in list("wxyz"):
-                return getattr(self.rotation, name[1])
-        elif name=="pos":
-            return self.translation
-        elif name=="att":
-            return self.rotation
-        raise AttributeError(name)
+        return Quaternion._wrap(self.data[:, 3:])
+
+    @property
+    def pos(self) -> Point:
+        return self.p
+
+    @property
+    def att(self) -> Quaternion:
+        return self.q
 
     @staticmethod
     def build(p:Point, q:Quaternion) -> Transformation:
-        if len(p) == len(q):
-            return Transformation(np.concatenate([
-                p.data,
-                q.data
-            ],axis=1))
-        elif len(p) == 1 and len(q) > 1:
-            return Transformation.build(p.tile(len(q)), q)
-        elif len(p) > 1 and len(q) >= 1:
-            return Transformation.build(q.tile(len(p)))
-        else:
+        if len(p) != len(q) and len(p) > 1 and len(q) > 1:
             raise ValueError("incompatible lengths")
+        n = max(len(p), len(q))
+        return Transformation._wrap(np.concatenate([
+            np.broadcast_to(p.data, (n, 3)),
+            np.broadcast_to(q.data, (n, 4))
+        ],axis=1, dtype=Transformation._dtype))
 
     @staticmethod
     def zero(count=1):
@@ -93,6 +87,22 @@ class Transformation(Base):
             -q1 * q2
         )
     
+    def compile(self) -> Self:
+        """Precompute the rotation matrices, later calls to apply, point, rotate (for Points)
+        and coord are then a matmul and an add. The cache is tied to the data array, it is
+        not used if data is replaced. Call compile again after editing data in place."""
+        rmat = self.q.to_rotation_matrix()
+        self._compiled = (self.data, rmat[0] if len(self) == 1 else rmat)
+        return self
+
+    def _rotation_matrix(self) -> np.ndarray | None:
+        """the compiled rotation matrix if it is still valid for the data"""
+        try:
+            data, rmat = self._compiled
+        except AttributeError:
+            return None
+        return rmat if data is self.data else None
+
     def apply(self, oin: Point | Quaternion | Self | Coord):
         if isinstance(oin, Point):
             return self.point(oin)
@@ -101,11 +111,14 @@ class Transformation(Base):
         elif isinstance(oin, Coord):
             return self.coord(oin)
         elif isinstance(oin, self.__class__):
-            return Transformation(self.apply(oin.p), self.apply(oin.q))
+            return Transformation.build(self.apply(oin.p), self.apply(oin.q))
         
 
     def rotate(self, oin: Point | Quaternion):
         if isinstance(oin, Point):
+            rmat = self._rotation_matrix()
+            if rmat is not None:
+                return oin.rotate(rmat)
             return self.q.transform_point(oin)
         elif isinstance(oin, Quaternion):
             return self.q * oin
@@ -114,9 +127,9 @@ class Transformation(Base):
 
     def offset(self, p: Point | Self):
         if isinstance(p, Point):
-            return Transformation(self.p + p, self.q)
+            return Transformation.build(self.p + p, self.q)
         elif isinstance(p, self.__class__):
-            return Transformation(self.p + p.p, self.q * p.q)
+            return Transformation.build(self.p + p.p, self.q * p.q)
         else:
             raise TypeError(f"expected a Point or a Transformation, got a {p.__class__.__name__}")
 
@@ -124,19 +137,78 @@ class Transformation(Base):
         return point + self.p
 
     def point(self, point: Point):
+        rmat = self._rotation_matrix()
+        if rmat is not None:
+            out = point.rotate(rmat).data
+            out += self.data[:, :3]
+            return Point._wrap(out)
         return self.translate(self.rotate(point))       
 
     def coord(self, coord=None):
         if coord is None:
             coord = Coord.zero()
-        return coord.translate(self.p).rotate(self.q)
+        rmat = self._rotation_matrix()
+        return coord.translate(self.p).rotate(self.q if rmat is None else rmat)
+
+
+    def inverse(self) -> Transformation:
+        """the transformation that undoes this one, t.inverse().point(t.point(p)) == p"""
+        out = np.empty_like(self.data)
+        q = self.data[:, 3:]
+        out[:, 3:] = q * np.array([1.0, -1.0, -1.0, -1.0]) / np.linalg.norm(q, axis=1, keepdims=True)
+        quaternion_rotate(out[:, 3:], -self.data[:, :3], normalized=True, out=out[:, :3])
+        return Transformation._wrap(out)
+
+    def compose(self, other: Transformation) -> Transformation:
+        """the transformation that applies other and then self, so
+        self.compose(other).point(p) == self.point(other.point(p)).
+        Either can have length 1, in which case it is applied to every row of the other."""
+        a, b = self.data, other.data
+        if len(a) != len(b) and len(a) > 1 and len(b) > 1:
+            raise ValueError(f"incompatible lengths for compose ({len(a)}) != ({len(b)})")
+        out = np.empty((max(len(a), len(b)), 7), dtype=np.result_type(a, b))
+        quaternion_rotate(a[:, 3:], b[:, :3], out=out[:, :3])
+        out[:, :3] += a[:, :3]
+        quaternion_product(a[:, 3:], b[:, 3:], out=out[:, 3:])
+        return Transformation._wrap(out)
 
+    def __matmul__(self, other: Transformation | Point | Quaternion | Coord):
+        """t1 @ t2 composes (t2 is applied first), t @ point etc applies"""
+        if isinstance(other, Transformation):
+            return self.compose(other)
+        elif isinstance(other, (Point, Quaternion, Coord)):
+            return self.apply(other)
+        return NotImplemented
 
-    def to_matrix(self):
-        outarr = np.identity(4).reshape(1,4,4)
-        outarr[:, :3,:3] = self.rotation.to_rotation_matrix()
-        outarr[:, 3,:3] = self.translation.data
-        return outarr
+    def to_matrix(self, convention: Literal["row", "column"] = "row", out: np.ndarray = None) -> np.ndarray:
+        """(N,4,4) homogeneous matrices.
+        row: for row vectors, [p, 1] @ M, the rotation is transposed and the translation is in row 3.
+        column: for column vectors, M @ [p, 1], the translation is in column 3."""
+        if out is None:
+            out = np.empty((len(self), 4, 4), dtype=self.data.dtype)
+        out[:, 3, :] = out[:, :, 3] = 0
+        out[:, 3, 3] = 1
+        if convention == "row":
+            self.q.to_rotation_matrix(out=out[:, :3, :3])
+            out[:, 3, :3] = self.data[:, :3]
+        elif convention == "column":
+            self.q.to_rotation_matrix(out=out[:, :3, :3].swapaxes(1, 2))
+            out[:, :3, 3] = self.data[:, :3]
+        else:
+            raise ValueError(f"unknown matrix convention {convention}")
+        return out
+
+    @staticmethod
+    def from_matrix(matrix: np.ndarray, convention: Literal["row", "column"] = "row") -> Transformation:
+        """Create from a (4,4) or (N,4,4) stack of homogeneous matrices, see to_matrix"""
+        matrix = np.reshape(matrix, (-1, 4, 4))
+        if convention == "row":
+            rmat, p = matrix[:, :3, :3].swapaxes(1, 2), matrix[:, 3, :3]
+        elif convention == "column":
+            rmat, p = matrix[:, :3, :3], matrix[:, :3, 3]
+        else:
+            raise ValueError(f"unknown matrix convention {convention}")
+        return Transformation.build(Point._wrap(p), Quaternion.from_rotation_matrix(rmat))
         
 
     def plot(self, fig=None, size: float=3, vis:Literal["coord", "plane"]="coord"):
@@ -150,3 +222,41 @@ class Transformation(Base):
         elif vis=="plane":
             fig.add_traces(meshes(len(self), self, scale=size))
         return fig
+
+
+class TransformChain:
+    """A sequence of transformations that are fused into one before they are applied.
+    They are in the same order as they would be written with @, so the last one is applied
+    first: TransformChain(t1, t2, t3).apply(p) == t1.point(t2.point(t3.point(p))).
+    The fused transformation is compiled and kept until any of the transforms' data changes.
+    """
+
+    def __init__(self, *transforms: Transformation):
+        self.transforms = list(transforms)
+        self._fused = None
+        self._key = ()
+
+    def __len__(self):
+        return len(self.transforms)
+
+    def __matmul__(self, other: TransformChain | Transformation | Point | Quaternion | Coord):
+        if isinstance(other, TransformChain):
+            return TransformChain(*self.transforms, *other.transforms)
+        elif isinstance(other, Transformation):
+            return TransformChain(*self.transforms, other)
+        return self.apply(other)
+
+    def fuse(self) -> Transformation:
+        """the single transformation equivalent to the chain"""
+        key = tuple(t.data for t in self.transforms)
+        if self._fused is None or len(key) != len(self._key) or any(
+            a is not b for a, b in zip(key, self._key)
+        ):
+            fused = Transformation.zero()
+            for t in self.transforms:
+                fused = fused.compose(t)
+            self._fused, self._key = fused.compile(), key
+        return self._fused
+
+    def apply(self, oin: Point | Quaternion | Transformation | Coord):
+        return self.fuse().apply(oin)
@@ -5,10 +5,12 @@ import numpy as np
 import pandas as pd
 
 
-def handle_slice(fun: Callable[[npt.NDArray, Number], Number]):
+def handle_slice(fun: Callable[[npt.NDArray, Number | npt.NDArray], Number | npt.NDArray]):
+    """apply fun to the start and stop of a slice, fun must accept a scalar or an
+    array of values, list-likes are passed to it as an array in a single call"""
     def inner(
         arr: npt.NDArray, value: slice | Number | npt.ArrayLike | None, *args, **kwargs
-    ) -> slice | Number | None:
+    ) -> slice | Number | npt.NDArray | None:
         if isinstance(value, slice):
             start = (
                 fun(arr, value.start, *args, **kwargs)
@@ -23,7 +25,7 @@ def handle_slice(fun: Callable[[npt.NDArray, Number], Number]):
             step = None  # TODO not sure how to handle this
             return slice(start, stop, step)
         elif pd.api.types.is_list_like(value):
-            return [fun(arr, val, *args, **kwargs) for val in value]
+            return fun(arr, np.asarray(value), *args, **kwargs)
         else:
             return None if value is None else fun(arr, value, *args, **kwargs)
 
@@ -33,54 +35,70 @@ def handle_slice(fun: Callable[[npt.NDArray, Number], Number]):
 @handle_slice
 def get_index(
     arr: npt.NDArray,
-    value: Number,
+    value: Number | npt.NDArray,
     missing: float | Literal["throw"] = "throw",
     direction: Literal["forward", "backward"] = "forward",
     increasing: bool = None
 ):
     """given a value, find the index of the first location in the aray,
     if no exact match, linearly interpolate in the index
-    assumes arr is monotonic increasing
+    assumes arr is monotonic
     raise value error outside of bounds and missing == "throw", else return missing
     increasing, is the array going up or down, if not given it will be inferred from the data
+    value can be an array, the lookups are a binary search so O(log n) per value
     """
-    increasing = np.sign(np.diff(arr).mean()) if increasing is None else increasing
-    res = np.argwhere(arr == value)
-    if len(res):
-        return res[0 if direction == "forward" else -1, 0]
-        # res[:,0]
-    if value > arr.max() or value < arr.min():
-        if missing == "throw":
-            raise ValueError(f"Time {value} is out of bounds")
-        else:
+    arr = np.asarray(arr)
+    if increasing is None:
+        # for a monotonic array this is the sign of the mean of the diffs
+        increasing = np.sign(arr[-1] - arr[0])
+    key, query = (arr, value) if increasing > 0 else (-arr, np.negative(value))
+
+    left = np.searchsorted(key, query, side="left")
+    right = np.searchsorted(key, query, side="right")
+    exact = left < right
+    match = left if direction == "forward" else right - 1
+    outside = (query < key[0]) | (query > key[-1])
+
+    if np.ndim(value) == 0:
+        if exact:
+            return match
+        elif outside:
+            if missing == "throw":
+                raise ValueError(f"Time {value} is out of bounds")
             return missing
 
-    i0 = np.nonzero(arr <= value if increasing > 0 else arr >= value)[0][-1]
-    i1 = i0 + 1
-    t0 = arr[i0]
-    t1 = arr[i1]
+    if missing == "throw" and np.any(outside):
+        raise ValueError(f"Time {np.asarray(value)[outside]} is out of bounds")
 
-    return i0 + (value - t0) / (t1 - t0)
+    i0 = np.clip(right - 1, 0, max(len(arr) - 2, 0))
+    t0 = arr[i0]
+    t1 = arr[np.minimum(i0 + 1, len(arr) - 1)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        res = i0 + (value - t0) / (t1 - t0)
+    if np.ndim(value) == 0:
+        return res
+    res = np.where(exact, match, res)
+    return res if missing == "throw" else np.where(outside, missing, res)
 
 
 @handle_slice
-def get_value(arr: npt.NDArray, index: Number):
+def get_value(arr: npt.NDArray, index: Number | npt.NDArray):
     """given an index, find the value in the array
     linearly interpolate if no exact match,
-    assumes arr is monotonic increasing"""
-    if index > len(arr) - 1:
+    assumes arr is monotonic increasing
+    index can be an array of indexes"""
+    index = np.where(np.asarray(index) < 0, len(arr) + np.asarray(index), index)
+    if np.any(index > len(arr) - 1) or np.any(index < 0):
         raise ValueError(f"Index {index} is out of bounds")
-    elif index < 0:
-        index = len(arr) + index
     frac = index % 1
-    if frac == 0:
-        return arr[int(index)]
+    i0 = np.trunc(index).astype(int)
+    if np.ndim(index) == 0 and frac == 0:
+        return arr[i0]
 
-    i0 = np.trunc(index)
-    i1 = i0 + 1
+    i1 = np.minimum(i0 + 1, len(arr) - 1)
 
-    v0 = arr[int(i0)]
-    v1 = arr[int(i1)]
+    v0 = arr[i0]
+    v1 = arr[i1]
     return v0 + (v1 - v0) * frac
 
 
@@ -102,3 +120,47 @@ def apply_index_slice(index: npt.NDArray, value: slice | Number | npt.ArrayLike
         return middle
     else:
         return index[value]
+
+
+def apply_index_slices(
+    index: npt.NDArray, starts: npt.ArrayLike, stops: npt.ArrayLike
+) -> list[npt.NDArray]:
+    """apply_index_slice for many (start, stop) pairs of fractional indexes at once.
+    Negative bounds count from the end, as they do in apply_index_slice.
+    The interpolated endpoints for all the windows are found in one call to get_value,
+    windows that do not need an interpolated endpoint are views of index."""
+    index = np.asarray(index)
+    starts = np.asarray(starts, dtype=float)
+    stops = np.asarray(stops, dtype=float)
+    n = len(index)
+
+    def bound(values):  # python slice semantics for the ceiled bounds
+        b = np.ceil(values).astype(int)
+        return np.where(b < 0, np.maximum(b + n, 0), np.minimum(b, n))
+
+    lo = bound(starts)
+    hi = bound(stops)
+
+    empty = starts >= stops
+    middle = hi > lo
+    head = ~empty & (~middle | (index[np.minimum(lo, n - 1)] != starts)) & (starts > index[0])
+    tail = ~empty & (~middle | (index[np.clip(hi - 1, 0, n - 1)] != stops)) & (stops < index[-1])
+
+    head_values = np.zeros(len(starts))
+    head_values[head] = get_value(index, starts[head])
+    tail_values = np.zeros(len(stops))
+    tail_values[tail] = get_value(index, stops[tail])
+
+    res = []
+    for i in range(len(starts)):
+        if empty[i]:
+            res.append(np.array([], dtype=index.dtype))
+        elif head[i] or tail[i]:
+            res.append(np.concatenate([
+                head_values[i : i + 1] if head[i] else [],
+                index[lo[i] : hi[i]],
+                tail_values[i : i + 1] if tail[i] else [],
+            ]))
+        else:
+            res.append(index[lo[i] : hi[i]])
+    return res
@@ -0,0 +1,58 @@
+from pytest import mark, raises
+from geometry import AttitudeIntegrator, Quaternion, Point, Time, Euler
+from geometry.checks import assert_almost_equal
+import numpy as np
+
+
+def coning(t):
+    return Point(np.cos(t), np.sin(t), np.full(len(t), 0.5))
+
+
+def test_exp_matches_body_rotate():
+    rates = Point(np.random.random((50, 3)))
+    q0 = Euler(0.1, 0.2, 0.3)
+    res = AttitudeIntegrator.integrate(rates, 0.02, q0)
+
+    q, expected = q0, [q0]
+    for i in range(49):
+        q = q.body_rotate(rates[i] * 0.02)
+        expected.append(q)
+    assert_almost_equal(res, Quaternion.concatenate(expected))
+
+
+def test_batches_match_single():
+    rates = coning(np.linspace(0, 5, 101))
+    single = AttitudeIntegrator.integrate(rates, 0.05, scheme="rk4")
+    integ = AttitudeIntegrator(scheme="rk4", capacity=8)
+    batches = [integ.update(rates[i:i + 17], np.full(17, 0.05)[: len(rates[i:i + 17])]) for i in range(0, 101, 17)]
+    assert_almost_equal(Quaternion.concatenate(batches), single)
+    assert_almost_equal(integ.attitudes, single)
+    assert len(integ) == 101
+
+    blocked = AttitudeIntegrator(scheme="rk4")
+    blocked.block_size = 7
+    np.testing.assert_array_equal(blocked.update(rates, 0.05).data, single.data)
+
+
+@mark.parametrize("scheme", ["exp", "rk4", "magnus"])
+def test_constant_rate(scheme):
+    rates = Point(np.tile([0.3, -0.2, 0.5], (51, 1)))
+    res = AttitudeIntegrator.integrate(rates, Time.from_t(np.linspace(0, 2, 51)), scheme=scheme)
+    assert_almost_equal(res[-1], Quaternion.from_axis_angle(rates[0] * 2))
+
+
+def test_higher_order():
+    t = np.linspace(0, 2, 21)
+    fine = np.linspace(0, 2, 20001)
+    ref = AttitudeIntegrator.integrate(coning(fine), fine[1] - fine[0], scheme="rk4")[::1000]
+    err = {
+        s: np.abs(AttitudeIntegrator.integrate(coning(t), 0.1, scheme=s).data - ref.data).max()
+        for s in ["exp", "rk4", "magnus"]
+    }
+    assert err["rk4"] < err["exp"] / 10
+    assert err["magnus"] < err["exp"] / 10
+
+
+def test_unknown_scheme():
+    with raises(ValueError):
+        AttitudeIntegrator(scheme="euler")
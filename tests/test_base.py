@@ -243,3 +243,132 @@ def test_plot():
     abc = ABC(np.random.random((10,3)))
     plot = abc.plot()
     plot2 = abc.plot(np.arange(len(abc))/10)
+
+
+def test_wrap():
+    data = np.random.random((5, 3))
+    abc = ABC._wrap(data)
+    assert isinstance(abc, ABC)
+    assert abc.data is data
+
+    assert (abc + 1).data.shape == (5, 3)
+    assert abc[2].data.shape == (1, 3)
+    assert abc.max().data.shape == (1, 3)
+    assert np.shares_memory(abc[1:3].data, data)
+
+
+def test_column_descriptors():
+    abc = ABC(np.random.random((5, 3)))
+    assert np.shares_memory(abc.b, abc.data)
+    np.testing.assert_array_equal(abc.b, abc.data[:, 1])
+    assert abc.c2 == abc.data[2, 2]
+
+    class ABCNp(ABC):
+        from_np = ["sin"]
+
+    np.testing.assert_array_equal(ABCNp(abc.data).sin.data, np.sin(abc.data))
+
+
+def test_array_ufunc():
+    abc = ABC(np.random.random((10, 3)))
+
+    res = np.sin(abc)
+    assert isinstance(res, ABC)
+    np.testing.assert_array_equal(res.data, np.sin(abc.data))
+
+    scalars = np.arange(10)
+    assert isinstance(scalars * abc, ABC)
+    np.testing.assert_array_equal((abc * scalars[:, None]).data, abc.data * scalars[:, None])
+    np.testing.assert_array_equal((scalars * abc).data, abc.data * scalars[:, None])
+    np.testing.assert_array_equal(np.add(ABC(1, 2, 3), scalars).data, np.array([1, 2, 3]) + scalars[:, None])
+
+    out = ABC(np.zeros((10, 3)))
+    np.multiply(abc, 2, out=out)
+    np.testing.assert_array_equal(out.data, abc.data * 2)
+
+    res = np.add(abc.data, abc.data, out=out)
+    assert res is out
+    np.testing.assert_array_equal(out.data, abc.data * 2)
+
+    with raises(TypeError):
+        np.add(abc, ABC(np.ones((5, 3))))
+
+
+def test_array_function():
+    a = ABC(np.random.random((5, 3)))
+    b = ABC(np.random.random((3, 3)))
+
+    c = np.concatenate([a, b])
+    assert isinstance(c, ABC)
+    assert len(c) == 8
+
+    d = np.vstack([a, b, np.zeros(3)])
+    assert isinstance(d, ABC)
+    np.testing.assert_array_equal(d.data, np.vstack([a.data, b.data, np.zeros(3)]))
+
+    np.testing.assert_array_equal(np.asarray(a), a.data)
+    np.testing.assert_array_equal(np.mean(a, axis=0), a.data.mean(axis=0))
+
+
+def test_length_check_views():
+    a = ABC(1, 2, 3)
+    b = ABC(np.ones((10, 3)))
+    a1, b1 = Base.length_check(a, b)
+    assert len(a1) == 10
+    assert np.shares_memory(a1.data, a.data)
+    assert b1 is b
+
+
+def test_dtype():
+    from geometry import Point, Quaternion, Coord, GPS, Time, PX
+    try:
+        Base.set_dtype(np.float32)
+        assert Point(1, 2, 3).dtype == np.float32
+        assert Point.zeros(5).dtype == np.float32
+        assert Quaternion.zero(5).dtype == np.float32
+        assert Coord.from_nothing(2).dtype == np.float32
+        assert (PX(1, 10) * np.linspace(0, 1, 10)).dtype == np.float32
+        assert (Quaternion.zero(3) * Quaternion.zero()).transform_point(PX()).dtype == np.float32
+        qs = Quaternion(np.random.random((10, 4))).norm()
+        assert qs.dtype == np.float32
+        assert qs.conjugate().dtype == np.float32
+        assert qs.inverse().dtype == np.float32
+        assert qs.to_axis_angle().dtype == np.float32
+        assert qs.diff(0.1).dtype == np.float32
+        assert qs.body_diff(np.full(10, 0.1)).dtype == np.float32
+        assert qs.slerp()(np.linspace(0, 9, 20)).dtype == np.float32
+        assert Point(np.random.random((10, 3))).linterp(None)(np.linspace(0, 9, 20)).dtype == np.float32
+        assert Point(np.random.random((10, 3))).diff(0.1).dtype == np.float32
+        assert Point(np.random.random((10, 3))).diff(np.full(10, 0.1), method="gradient").dtype == np.float32
+        assert GPS(52.5, -1.6, 0).dtype == np.float64
+        assert Time.uniform(1, 10).dtype == np.float64
+        assert Point(1, 2, 3).astype(np.float64).dtype == np.float64
+    finally:
+        Base.set_dtype(np.float64)
+    assert Point(1, 2, 3).dtype == np.float64
+
+
+def test_slices():
+    from geometry import Point, Quaternion
+
+    p = Point(np.random.random((20, 3)))
+    windows = p.slices([0.5, 2, 10], [3, 5.25, 4])
+    assert [len(w) for w in windows] == [4, 5, 0]
+    np.testing.assert_array_almost_equal(windows[0].data[0], (p.data[0] + p.data[1]) / 2)
+    np.testing.assert_array_equal(windows[0].data[1:], p.data[1:4])
+    np.testing.assert_array_almost_equal(windows[1].data[-1], p.data[5] + (p.data[6] - p.data[5]) / 4)
+
+    t = np.linspace(0, 1.9, 20)
+    timed = p.slices([0.05], [0.3], index=t)
+    np.testing.assert_array_almost_equal(timed[0].data, windows[0].data)
+
+    single = p.slices(0.5, 3)
+    assert len(single) == 1
+    np.testing.assert_array_almost_equal(single[0].data, windows[0].data)
+    assert p.slices([], []) == []
+    assert p.slices([], [], index=t) == []
+    assert [len(w) for w in p.slices([10, 12], [4, 6])] == [0, 0]
+
+    q = Quaternion(np.random.random((20, 4))).norm()
+    qw = q.slices([0.5], [3])[0]
+    np.testing.assert_array_almost_equal(qw.data[0], q.slerp()(np.array([0.5])).data[0])
@@ -30,3 +30,28 @@ def test_rotate():
     np.testing.assert_almost_equal(rc.x_axis.data, PY(1,10).data)
     np.testing.assert_almost_equal(rc.y_axis.data, PX(-1,10).data)
     np.testing.assert_almost_equal(rc.z_axis.data, PZ(1,10).data)
+
+
+def test_rotate_batch():
+    qs = Quaternion(np.random.random((10, 4))).norm()
+    c = Coord.from_xy(Point(1, 2, 3), PY(), PZ())
+    rc = c.rotate(qs)
+    for axis in ["x_axis", "y_axis", "z_axis"]:
+        np.testing.assert_almost_equal(
+            getattr(rc, axis).data, qs.transform_point(getattr(c, axis)).data
+        )
+    np.testing.assert_array_equal(rc.origin.data, np.tile([[1, 2, 3]], (10, 1)))
+    np.testing.assert_array_equal(c.rotate(qs.to_rotation_matrix()).data, rc.data)
+
+
+def test_translate():
+    c = Coord.from_nothing(5).translate(Point(1, 2, 3))
+    np.testing.assert_array_equal(c.origin.data, np.tile([[1, 2, 3]], (5, 1)))
+    np.testing.assert_array_equal(c.rotation_matrix(), Coord.from_nothing(5).rotation_matrix())
+
+
+def test_axes_cached():
+    coord = Coord.from_nothing(5)
+    assert not hasattr(coord, "__dict__")
+    assert coord.x_axis is coord.x_axis
+    assert np.shares_memory(coord.z_axis.data, coord.data)
@@ -51,3 +51,14 @@ def test_sub():
     assert abs(vec)[0] == approx(54.167, 1e-3)
     assert vec.x[0] == approx(12.3563, 1e-3)
     assert vec.y[0] == approx(52.7393, 1e-3)
+
+
+def test_sub_broadcast():
+    centre = GPS(52.542375, -1.631038, 0)
+    pilots = GPS(np.tile([52.542264, -1.631817, 0], (5, 1)))
+
+    np.testing.assert_array_almost_equal((pilots - centre).data, (pilots - centre.tile(5)).data)
+    np.testing.assert_array_almost_equal((centre - pilots).data, (centre.tile(5) - pilots).data)
+    np.testing.assert_array_almost_equal(
+        centre.offset(pilots - centre).data, pilots.data
+    )
@@ -0,0 +1,86 @@
+from pytest import raises
+from geometry import TimeIndex, Base, Point, Quaternion, Time, resample
+from geometry.checks import assert_almost_equal
+import numpy as np
+
+
+def test_plan():
+    index = TimeIndex(np.array([0.0, 1.0, 2.0, 4.0]))
+    plan = index.plan([-1, 0, 0.5, 3, 4, 5])
+    np.testing.assert_array_equal(plan.i0, [0, 0, 0, 2, 3, 3])
+    np.testing.assert_array_equal(plan.i1, [0, 0, 1, 3, 3, 3])
+    np.testing.assert_array_equal(plan.weights, [0, 0, 0.5, 0.5, 0, 0])
+    np.testing.assert_array_equal(plan.below, [True, False, False, False, False, False])
+    np.testing.assert_array_equal(plan.above, [False, False, False, False, False, True])
+    np.testing.assert_array_equal(plan.exact, [False, True, False, False, True, False])
+    with raises(Exception):
+        plan.check()
+
+
+def test_time_index():
+    t = Time.from_t(np.linspace(0, 1, 5))
+    assert isinstance(TimeIndex.build(t, 5), TimeIndex)
+    np.testing.assert_array_equal(TimeIndex.build(None, 3).index, [0, 1, 2])
+    with raises(ValueError):
+        TimeIndex(np.array([0, 2, 1]))
+    with raises(ValueError):
+        TimeIndex.build(t, 4)
+
+
+def test_shared_plan():
+    t = Time.from_t(np.linspace(0, 2, 21))
+    index = TimeIndex(t)
+    plan = index.plan(np.linspace(0.05, 1.95, 40))
+    p = Point(np.random.random((21, 3)))
+    q = Quaternion(np.random.random((21, 4))).norm()
+
+    assert_almost_equal(p.linterp(index)(plan), p.linterp(t.t)(plan.ts))
+    assert_almost_equal(q.slerp(index)(plan), q.slerp(t.t)(plan.ts))
+    assert_almost_equal(t.linterp(index)(plan), t.linterp(t.t)(plan.ts))
+
+    with raises(ValueError):
+        p.linterp(t.t * 2)(plan)
+
+
+def test_resample():
+    t = Time.from_t(np.linspace(0, 2, 21))
+    pos = Point(np.random.random((21, 3)))
+    att = Quaternion(np.random.random((21, 4))).norm()
+    ts = np.linspace(0.05, 1.95, 40)
+
+    res = resample(t, ts, pos=pos, vel=pos * 2, att=att, acc=pos, methods=dict(acc="linterp"))
+    assert_almost_equal(res["time"], t.interpolate(t.t)(ts))
+    assert_almost_equal(res["pos"], pos.interpolate(t.t)(ts))
+    assert_almost_equal(res["vel"], (pos * 2).interpolate(t.t)(ts))
+    assert_almost_equal(res["att"], att.interpolate(t.t)(ts))
+    assert_almost_equal(res["acc"], pos.linterp(t.t)(ts))
+
+    with raises(Exception):
+        resample(t, [3], pos=pos)
+
+
+def test_resample_dtype():
+    t = Time.from_t(np.linspace(0, 2, 21))
+    Base.set_dtype(np.float32)
+    try:
+        pos = Point(np.random.random((21, 3)))
+        res = resample(t, np.linspace(0.05, 1.95, 40), pos=pos, acc=pos, methods=dict(acc="linterp"))
+        assert res["pos"].dtype == np.float32
+        assert res["acc"].dtype == np.float32
+    finally:
+        Base.set_dtype(np.float64)
+
+
+def test_extrapolate():
+    t = np.linspace(0, 1, 11)
+    p = Point(np.random.random((11, 3)))
+    q = Quaternion(np.random.random((11, 4))).norm()
+
+    # linterp holds the first value below the range, as it always has
+    np.testing.assert_array_equal(p.linterp(t)([-0.1, 0.5]).data[0], p.data[0])
+    assert Time.from_t(t).linterp(t)([-0.1, 0.5]).t[0] == 0
+    with raises(Exception):
+        p.linterp(t)([0.5, 1.1])
+    with raises(Exception):
+        q.slerp(t)([-0.1, 0.5])
+    assert_almost_equal(p.linterp(t, "nearest")([1.1]), p[-1])
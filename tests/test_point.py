@@ -4,7 +4,8 @@ import unittest
 from math import pi
 from pytest import mark, approx, fixture, raises
 import numpy as np
-from geometry.checks import assert_equal
+from geometry.checks import assert_equal, assert_almost_equal
+from geometry.quaternion import Quaternion
 
 def test_init():
     p = Point(1,2,3)
@@ -88,6 +89,25 @@ def test_to_rotation_matrix():
     np.testing.assert_array_equal(P0().to_rotation_matrix()[0],np.identity(3))
 
 
+def test_rotate():
+    qs = Quaternion(np.random.random((20, 4))).norm()
+    ps = Point(np.random.random((20, 3)))
+    assert_almost_equal(ps.rotate(qs.to_rotation_matrix()), qs.transform_point(ps))
+    assert_almost_equal(ps.rotate(qs[0].to_rotation_matrix()[0]), qs[0].transform_point(ps))
+    assert_almost_equal(ps[0].rotate(qs.to_rotation_matrix()), qs.transform_point(ps[0]))
+
+    eul = Point(0.1, 0.2, 0.3)
+    assert_almost_equal(
+        ps.rotate(np.swapaxes(eul.to_rotation_matrix(), -1, -2)),
+        Quaternion.from_euler(eul).transform_point(ps),
+    )
+
+    out = np.empty((20, 3))
+    assert ps.rotate(qs.to_rotation_matrix(), out=out).data is out
+    with raises(TypeError):
+        ps.rotate(np.identity(4))
+
+
 def test_vector_projection():
     res = Point.vector_projection(PX(1,20), PY(1))
     assert res == P0()
@@ -135,4 +155,15 @@ def test_bspline():
     fig = splinepoints.plot3d(mode="lines")
     fig.add_traces(p.plot3d().data)
     fig.show()
-#    px.line(x=xs, y=.data).show()
\ No newline at end of file
+#    px.line(x=xs, y=.data).show()
+
+def test_arbitrary_perpendicular():
+    ps = Point(np.random.random((100, 3)) - 0.5)
+    perp = ps.arbitrary_perpendicular()
+    assert np.all(is_perpendicular(ps, perp))
+
+    expected = Point.concatenate([
+        p.cross(Point(*[1 if axis == i else 0 for i in range(3)]))
+        for p, axis in zip(ps, np.argmin(np.abs(ps.data), axis=1))
+    ])
+    assert_equal(perp, expected)
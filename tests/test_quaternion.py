@@ -1,5 +1,5 @@
-from pytest import approx, mark
-from geometry.quaternion import Quaternion, Q0
+from pytest import approx, importorskip, mark, raises
+from geometry.quaternion import Quaternion, Q0, quaternion_product
 from geometry.point import Point, PX, PY, PZ, P0
 from geometry import Euler, Euldeg
 from geometry.checks import assert_almost_equal
@@ -42,6 +42,36 @@ def test_from_euler_unwrap():
 
 
 
+@mark.parametrize("sequence", ["zyx", "xyz", "yzx", "zxz", "xyx", "yzy"])
+def test_euler_sequences(sequence):
+    Rotation = importorskip("scipy.spatial.transform").Rotation
+    q = Quaternion(np.random.random((50, 4)) - 0.5).norm()
+    ref = Rotation.from_quat(np.roll(q.data, -1, axis=1)).as_euler(sequence.upper())
+    # stay clear of gimbal lock, where zyx uses its own (wider) threshold
+    lock = 0 if sequence[0] == sequence[2] else np.pi / 2
+    clear = np.abs(np.abs(ref[:, 1] - lock) - np.pi / 2) < np.pi / 2 - 0.05
+    q, ref = q[clear], ref[clear]
+    if sequence[0] != sequence[2]:
+        ref[:, ["xyz".index(a) for a in sequence]] = ref.copy()
+
+    out = np.empty((len(q), 3))
+    eul = q.to_euler(sequence, out=out)
+    np.testing.assert_array_almost_equal(eul.data, ref)
+    assert eul.data is out
+
+    q2 = Quaternion.from_euler(eul, sequence)
+    np.testing.assert_array_almost_equal(np.abs(np.sum(q2.data * q.data, axis=1)), 1)
+
+
+def test_euler_sequence_gimbal():
+    q = Quaternion.from_euler(Point(0.3, np.pi / 2, 0.4), "xyz")
+    eul = q.to_euler("xyz")
+    assert eul.z[0] == 0
+    assert_almost_equal(Quaternion.from_euler(eul, "xyz"), q)
+    with raises(ValueError):
+        q.to_euler("xxy")
+
+
 def test_norm():
     qarr = Quaternion(np.random.random( (2,4)))
 
@@ -165,6 +195,20 @@ def test_body_diff_constant():
 
 
 
+def test_to_rotation_matrix_out():
+    q = Quaternion(np.random.random((20, 4)))
+    rmats = q.to_rotation_matrix()
+    assert rmats.shape == (20, 3, 3) and rmats.flags["C_CONTIGUOUS"]
+    p = Point(np.random.random((20, 3)))
+    np.testing.assert_array_almost_equal(
+        np.einsum("ni,nij->nj", p.data, rmats), q.transform_point(p).data
+    )
+
+    out = np.empty((20, 3, 3))
+    assert q.norm().to_rotation_matrix(out=out, normalized=True) is out
+    np.testing.assert_array_almost_equal(out, rmats)
+
+
 #@mark.skip("to be thought about later")        
 def test_from_rotation_matrix():
 
@@ -238,3 +282,122 @@ def test_backward_diff_problem():
 
 
 
+
+
+def test_quaternion_product():
+    a = Quaternion(np.random.random((10, 4))).norm()
+    b = Quaternion(np.random.random((10, 4))).norm()
+
+    w = a.w * b.w - a.axis.dot(b.axis)
+    xyz = a.w * b.axis + b.w * a.axis + a.axis.cross(b.axis)
+    expected = np.column_stack([w, xyz.data])
+
+    np.testing.assert_array_almost_equal((a * b).data, expected)
+    np.testing.assert_array_almost_equal((a[0] * b).data, (a[0].tile(10) * b).data)
+
+    out = a.data.copy()
+    quaternion_product(out, b.data, out=out)
+    np.testing.assert_array_almost_equal(out, expected)
+
+    with raises(TypeError):
+        a * b[:5]
+
+
+def test_quaternion_rotate():
+    qs = Quaternion(np.random.random((10, 4))).norm()
+    ps = Point(np.random.random((10, 3)))
+
+    expected = (qs * Quaternion(np.column_stack([np.zeros(10), ps.data])) * qs.inverse()).axis
+
+    assert_almost_equal(qs.transform_point(ps), expected)
+    assert_almost_equal(qs.transform_point(ps, normalized=True), expected)
+    assert_almost_equal((qs * 2).transform_point(ps), expected)
+    assert_almost_equal(qs[0].transform_point(ps), qs[0].tile(10).transform_point(ps))
+    assert_almost_equal(qs.transform_point(ps[0]), qs.transform_point(ps[0].tile(10)))
+
+    with raises(TypeError):
+        qs.transform_point(ps[:5])
+
+
+def test_from_rotation_matrix_batch():
+    qs = Quaternion.concatenate([
+        Quaternion(np.random.random((50, 4)) - 0.5).norm(),
+        Quaternion.from_axis_angle(Point(np.random.random((50, 3)) - 0.5).unit() * np.pi),
+        Quaternion.from_axis_angle(Point(np.random.random((50, 3)) - 0.5).unit() * (np.pi - 1e-9)),
+        Euldeg(180, 0, 0), Euldeg(0, 180, 0), Euldeg(0, 0, 180), Q0()
+    ])
+    rmats = qs.to_rotation_matrix()
+    res = Quaternion.from_rotation_matrix(rmats)
+
+    assert len(res) == len(qs)
+    np.testing.assert_array_almost_equal(res.inverse().to_rotation_matrix(), rmats)
+    np.testing.assert_array_almost_equal(
+        np.abs(np.einsum("ij,ij->i", res.data, qs.inverse().data)), np.ones(len(qs))
+    )
+
+    for rmat, q in zip(rmats[:5], res[:5]):
+        np.testing.assert_array_equal(Quaternion.from_rotation_matrix(rmat).data, q.data)
+
+
+def test_from_axis_angle_accuracy():
+    angles = np.concatenate([[0, 2e-6, 1e-3], np.linspace(0.01, 2 * np.pi, 1000)])
+    axes = Point(np.random.random((len(angles), 3)) - 0.5).unit()
+
+    qs = Quaternion.from_axis_angle(axes * angles)
+
+    np.testing.assert_allclose(qs.w, np.cos(angles / 2), rtol=0, atol=1e-15)
+    np.testing.assert_allclose(
+        qs.axis.data, axes.data * np.sin(angles / 2)[:, None], rtol=0, atol=1e-15
+    )
+    np.testing.assert_allclose(abs(qs), np.ones(len(angles)), rtol=0, atol=1e-15)
+    assert Quaternion.from_axis_angle(P0(5)) == Q0(5)
+    assert Quaternion.from_axis_angle(axes[:3] * np.array([1e-12, 1e-9, 9e-7])) == Q0(3)
+
+
+def test_to_axis_angle_shortest():
+    axes = Point(np.random.random((100, 3)) - 0.5).unit()
+    angles = np.linspace(1e-5, np.pi - 1e-6, 100)
+    qs = Quaternion.from_axis_angle(axes * angles)
+
+    assert_almost_equal(qs.to_axis_angle(), axes * angles)
+    assert_almost_equal((-qs).to_axis_angle(), axes * angles)
+    assert_almost_equal((-qs)._to_axis_angle(), -axes * (2 * np.pi - angles))
+    assert Quaternion(0, 0, 0, 0).to_axis_angle() == P0()
+
+
+def test_stream_diff():
+    qs = Quaternion.from_euler(Point(np.cumsum(np.random.random((100, 3)) - 0.5, axis=0)))
+    dt = np.random.random(100) * 0.1 + 0.01
+
+    def chunks(sizes):
+        i = 0
+        for size in sizes:
+            yield qs[i:i + size], dt[i:i + size]
+            i += size
+
+    for sizes in [[100], [1] * 100, [10, 0, 1, 39, 50]]:
+        np.testing.assert_array_equal(
+            Point.concatenate(list(Quaternion.stream_diff(chunks(sizes), count=100))).data,
+            qs.diff(dt).data
+        )
+        np.testing.assert_array_equal(
+            Point.concatenate(list(Quaternion.stream_diff(chunks(sizes), count=100, body=True))).data,
+            qs.body_diff(dt).data
+        )
+
+
+def test_stream_diff_reused_buffer():
+    qs = Quaternion.from_euler(Point(np.cumsum(np.random.random((100, 3)) - 0.5, axis=0)))
+    dt = np.random.random(100) * 0.1 + 0.01
+
+    def reader():
+        qbuf, dtbuf = np.empty((10, 4)), np.empty(10)
+        for i in range(0, 100, 10):
+            qbuf[:] = qs.data[i:i + 10]
+            dtbuf[:] = dt[i:i + 10]
+            yield Quaternion._wrap(qbuf), dtbuf
+
+    np.testing.assert_array_equal(
+        Point.concatenate(list(Quaternion.stream_diff(reader(), count=100))).data,
+        qs.diff(dt).data
+    )
@@ -1,5 +1,5 @@
 import numpy as np
-from geometry import P0, PX, PY, PZ, Coord, Point, Quaternion, Transformation
+from geometry import P0, PX, PY, PZ, Coord, Point, Quaternion, Transformation, TransformChain
 from geometry.checks import assert_almost_equal
 
 
@@ -62,3 +62,71 @@ def test_to_matrix():
     )
 
     
+
+
+def test_attributes():
+    t = Transformation(Point(1, 2, 3), Quaternion(0, 1, 0, 0))
+    assert t.x[0] == 1 and t.z[0] == 3
+    assert t.rw[0] == 0 and t.rx[0] == 1
+    assert t.pos == Point(1, 2, 3)
+    assert t.att == Quaternion(0, 1, 0, 0)
+
+
+def test_build_broadcast():
+    ps = Point(np.random.random((5, 3)))
+    qs = Quaternion.from_euler(Point(np.random.random((5, 3))))
+
+    np.testing.assert_array_equal(Transformation.build(ps, qs[0]).q.data, qs[0].tile(5).data)
+    np.testing.assert_array_equal(Transformation.build(ps[0], qs).p.data, ps[0].tile(5).data)
+
+
+def test_compile():
+    t = Transformation.build(Point(np.random.random((1, 3))), Quaternion(np.random.random((1, 4))).norm())
+    ps = Point(np.random.random((100, 3)))
+    c = Coord.from_xy(Point(1, 2, 3), PY(), PZ())
+    expected = t.point(ps), t.coord(c), t.rotate(ps)
+
+    tc = Transformation(t.data.copy()).compile()
+    assert tc._rotation_matrix().shape == (3, 3)
+    assert_almost_equal(tc.point(ps), expected[0])
+    assert_almost_equal(tc.apply(c), expected[1])
+    assert_almost_equal(tc.rotate(ps), expected[2])
+
+    tc.data = Transformation.zero().data
+    assert tc._rotation_matrix() is None
+    assert_almost_equal(tc.point(ps), ps)
+
+    tn = Transformation.build(Point(np.random.random((100, 3))), Quaternion(np.random.random((100, 4))).norm())
+    assert_almost_equal(Transformation(tn.data).compile().point(ps), tn.point(ps))
+
+
+def test_inverse_compose():
+    def rand(n):
+        return Transformation.build(Point(np.random.random((n, 3))), Quaternion(np.random.random((n, 4))).norm())
+    t1, t2, t3 = rand(20), rand(1), rand(20)
+    ps = Point(np.random.random((20, 3)))
+
+    assert_almost_equal(t1.inverse().point(t1.point(ps)), ps)
+    assert_almost_equal(t1.compose(t2).point(ps), t1.point(t2.point(ps)))
+    assert_almost_equal(t2 @ t1, t2.apply(t1))
+    assert_almost_equal(t1 @ ps, t1.point(ps))
+
+    chain = TransformChain(t1, t2, t3)
+    assert_almost_equal(chain.apply(ps), t1.point(t2.point(t3.point(ps))))
+    assert chain.fuse() is chain.fuse()
+    assert_almost_equal((TransformChain(t1) @ t2 @ t3).apply(ps), chain.apply(ps))
+
+
+def test_to_from_matrix():
+    t = Transformation.build(Point(np.random.random((20, 3))), Quaternion(np.random.random((20, 4))).norm())
+    ps = Point(np.random.random((20, 3)))
+    hom = np.column_stack([ps.data, np.ones(20)])
+
+    row = t.to_matrix()
+    np.testing.assert_array_almost_equal(np.einsum("ni,nij->nj", hom, row)[:, :3], t.point(ps).data)
+    col = t.to_matrix("column")
+    np.testing.assert_array_almost_equal(np.einsum("nij,nj->ni", col, hom)[:, :3], t.point(ps).data)
+    np.testing.assert_array_almost_equal(col, row.swapaxes(1, 2))
+
+    assert_almost_equal(Transformation.from_matrix(row).point(ps), t.point(ps))
+    assert_almost_equal(Transformation.from_matrix(col, "column").point(ps), t.point(ps))
@@ -1,5 +1,5 @@
 from pytest import raises, mark
-from geometry.utils import get_index, get_value, apply_index_slice
+from geometry.utils import get_index, get_value, apply_index_slice, apply_index_slices
 import numpy as np
 
 def test_get_index():
@@ -23,6 +23,22 @@ def test_get_index_repeat():
     assert get_index(arr, 1.5) == 3.5
 
 
+def test_get_index_array():
+    arr = np.array([0, 1, 1, 1, 2, 3, 4])
+    np.testing.assert_array_equal(get_index(arr, [3, 1, 0.5, 1.5]), [5, 1, 0.5, 3.5])
+    np.testing.assert_array_equal(get_index(arr, np.array([1, 5]), missing=-1, direction="backward"), [3, -1])
+    with raises(ValueError):
+        get_index(arr, [1, 5])
+
+
+def test_get_index_decreasing():
+    arr = np.array([4, 3, 2, 2, 1, 0])
+    assert get_index(arr, 2) == 2
+    assert get_index(arr, 2, direction="backward") == 3
+    assert get_index(arr, 2.5) == 1.5
+    np.testing.assert_array_equal(get_index(arr, [0.5, 3]), [4.5, 1])
+
+
 def test_get_value():   
     arr = np.arange(10)
     assert get_value(arr, 5) == 5
@@ -33,9 +49,31 @@ def test_get_value():
         get_value(arr, 10)
 
 
+def test_get_value_array():
+    arr = np.arange(10) * 2
+    np.testing.assert_array_equal(get_value(arr, [0, 2.5, -1]), [0, 5, 18])
+    with raises(ValueError):
+        get_value(arr, [1, 9.5])
+
+
+
 def test_apply_index_slice():
     assert np.all(apply_index_slice(np.arange(10), slice(1, 5)) == np.array([1, 2, 3, 4, 5]))
     assert np.all(apply_index_slice(np.arange(10), slice(0.5, 1.5)) == np.array([0.5, 1, 1.5]))
     assert np.all(apply_index_slice(np.arange(10), slice(0.5, 3.5)) == np.array([0.5, 1,  2, 3, 3.5]))
     assert np.all(apply_index_slice(np.arange(1), slice(0, 5)) == np.array([0]))
-    
\ No newline at end of file
+    
+
+def test_apply_index_slices():
+    starts, stops = [1, 0.5, 0.5, 0, 4], [5, 1.5, 3.5, 5, 2]
+    for res, start, stop in zip(apply_index_slices(np.arange(10), starts, stops), starts, stops):
+        np.testing.assert_array_equal(res, apply_index_slice(np.arange(10), slice(start, stop)))
+    index = np.arange(10)
+    assert np.shares_memory(apply_index_slices(index, [0], [9])[0], index)
+
+
+def test_apply_index_slices_negative():
+    starts, stops = [-2, -3.5, -0.5, 1], [-1.44, 4, 3, -2]
+    for res, start, stop in zip(apply_index_slices(np.arange(5), starts, stops), starts, stops):
+        np.testing.assert_array_equal(res, apply_index_slice(np.arange(5), slice(start, stop)))
+    np.testing.assert_array_almost_equal(apply_index_slices(np.arange(5), [-2], [-1.44])[0], [3, 3.56])